@@ -471,3 +471,7 @@ _TCMS_CLASS_NAME_ATTRIBUTES = {TCMS_CLASS_ID_BUILD: ATTR_NAME, TCMS_CLASS_ID_CAT
                                TCMS_CLASS_ID_TEST_EXECUTION_STATUS: ATTR_NAME, TCMS_CLASS_ID_TEST_PLAN: ATTR_NAME,
                                TCMS_CLASS_ID_TEST_RUN: None, TCMS_CLASS_ID_USER: ATTR_USERNAME,
                                TCMS_CLASS_ID_VERSION: ATTR_VALUE}
+
+# TCMS class ID and name attribute for each master data type
+MASTER_DATA_TYPE_CLASS_INFOS = {_data_type: (_class_id, _TCMS_CLASS_NAME_ATTRIBUTES[_class_id])
+                                for _data_type, _class_id in MASTER_DATA_TYPE_TCMS_CLASS_IDS.items()}
@@ -37,6 +37,7 @@ Functions to handle attachments of TCMS objects.
 """
 
 from base64 import b64encode
+from concurrent.futures import as_completed
 import re
 
 import requests
@@ -45,7 +46,7 @@ import urllib3
 from issai.core import *
 from issai.core.issai_exception import IssaiException
 from issai.core.messages import *
-from issai.core.tcms import upload_entity_attachment
+from issai.core.tcms import cancel_tcms_requests, submit_tcms_request, upload_entity_attachment
 
 
 def attachment_file_path(root_path, file_name, tcms_class_id, tcms_entity_id):
@@ -61,7 +62,7 @@ def attachment_file_path(root_path, file_name, tcms_class_id, tcms_entity_id):
     return os.path.join(root_path, ATTACHMENTS_ROOT_DIR, _subdir, str(tcms_entity_id), file_name)
 
 
-def download_attachment(file_name_patterns, root_path, url, tcms_class_id, tcms_entity_id, task_monitor):
+def download_attachment(file_name_patterns, root_path, url, tcms_class_id, tcms_entity_id):
     """
     Downloads a file attached to a test entity from TCMS.
     :param list[str] file_name_patterns: regular expression patterns attachment files must match to be downloaded
@@ -69,7 +70,8 @@ def download_attachment(file_name_patterns, root_path, url, tcms_class_id, tcms_
     :param str url: the attachment URL in TCMS
     :param int tcms_class_id: the TCMS entity class ID
     :param int tcms_entity_id: the TCMS entity ID
-    :param TaskMonitor task_monitor: the progress handler
+    :returns: full path of downloaded file; None, if file name doesn't match the patterns
+    :rtype: str
     :raises IssaiException: if download failed
     """
     try:
@@ -79,15 +81,13 @@ def download_attachment(file_name_patterns, root_path, url, tcms_class_id, tcms_
             for _pattern in file_name_patterns:
                 if re.match(_pattern, _file_name):
                     break
-            return
+            return None
         _full_file_path = attachment_file_path(root_path, _file_name, tcms_class_id, tcms_entity_id)
-        task_monitor.log(I_DOWNLOAD_ATTACHMENT, _full_file_path)
-        if task_monitor.is_dry_run():
-            return
         os.makedirs(os.path.dirname(_full_file_path), exist_ok=True)
         r = requests.get(url)
         with open(_full_file_path, 'w') as f:
             f.write(r.text)
+        return _full_file_path
     except Exception as _e:
         raise IssaiException(E_DOWNLOAD_ATTACHMENT_FAILED, url, _e)
 
@@ -103,14 +103,47 @@ def download_attachments(entity, output_path, task_monitor, file_name_patterns=(
     :param list[str] file_name_patterns: regular expression patterns attachment files must match to be downloaded
     :raises IssaiException: if download operation fails
     """
+    wait_for_attachment_downloads(start_attachment_downloads(entity, output_path, task_monitor, file_name_patterns),
+                                  task_monitor)
+
+
+def start_attachment_downloads(entity, output_path, task_monitor, file_name_patterns=()):
+    """
+    Starts downloading all attachments of specified entity, see download_attachments. Attachments are independent
+    of each other and downloaded in parallel. The caller must wait for the returned downloads to complete using
+    function wait_for_attachment_downloads.
+    :param Entity entity: the entity
+    :param str output_path: the output path
+    :param TaskMonitor task_monitor: the progress handler
+    :param list[str] file_name_patterns: regular expression patterns attachment files must match to be downloaded
+    :returns: the pending downloads
+    :rtype: list[concurrent.futures.Future]
+    """
     task_monitor.log(I_DOWNLOAD_ATTACHMENTS, entity.entity_name())
     task_monitor.operations_processed(1)
-    _attachments_path = os.path.join(output_path, ATTACHMENTS_ROOT_DIR)
-    for _class_id, _objects in entity.attachments().items():
-        for _object_id, _urls in _objects.items():
-            for _url in _urls:
-                if not task_monitor.is_dry_run():
-                    download_attachment(file_name_patterns, output_path, _url, _class_id, _object_id, task_monitor)
+    if task_monitor.is_dry_run():
+        return []
+    return [submit_tcms_request(download_attachment, file_name_patterns, output_path, _url, _class_id, _object_id)
+            for _class_id, _objects in entity.attachments().items()
+            for _object_id, _urls in _objects.items() for _url in _urls]
+
+
+def wait_for_attachment_downloads(downloads, task_monitor):
+    """
+    Waits for attachment downloads started by function start_attachment_downloads to complete.
+    Progress is reported from the calling thread. Downloads not started yet are cancelled, if a download fails or
+    the user requests task abortion.
+    :param list[concurrent.futures.Future] downloads: the pending downloads
+    :param TaskMonitor task_monitor: the progress handler
+    :raises IssaiException: if download failed or task abortion was requested
+    """
+    try:
+        for _download in as_completed(downloads):
+            _file_path = _download.result()
+            if _file_path is not None:
+                task_monitor.log(I_DOWNLOAD_ATTACHMENT, _file_path)
+    finally:
+        cancel_tcms_requests(downloads)
 
 
 def upload_attachment(root_path, file_name, file_entity_id, tcms_class_id, tcms_entity_id):
@@ -124,9 +124,9 @@ _ENTITY_ATTRIBUTES = {
 }
 
 # TOML master data types
-_MASTER_DATA_TYPES = {ATTR_CASE_CATEGORIES, ATTR_CASE_COMPONENTS, ATTR_CASE_PRIORITIES, ATTR_CASE_STATUSES,
-                      ATTR_EXECUTION_STATUSES, ATTR_PLAN_TYPES, ATTR_PRODUCT_BUILDS, ATTR_PRODUCT_CLASSIFICATIONS,
-                      ATTR_PRODUCT_VERSIONS, ATTR_TCMS_USERS}
+_MASTER_DATA_TYPES = frozenset({ATTR_CASE_CATEGORIES, ATTR_CASE_COMPONENTS, ATTR_CASE_PRIORITIES, ATTR_CASE_STATUSES,
+                                ATTR_EXECUTION_STATUSES, ATTR_PLAN_TYPES, ATTR_PRODUCT_BUILDS,
+                                ATTR_PRODUCT_CLASSIFICATIONS, ATTR_PRODUCT_VERSIONS, ATTR_TCMS_USERS})
 
 # Mapping of master data type to TCMS class
 _MASTER_DATA_TCMS_CLASSES = {ATTR_CASE_CATEGORIES: TCMS_CLASS_CATEGORY, ATTR_CASE_COMPONENTS: TCMS_CLASS_COMPONENT,
@@ -40,11 +40,18 @@ Test plans and test cases are also subject to export/import and can be executed.
 Test plan results and test case results can be imported to TCMS.
 """
 
-import copy
+import functools
 import re
+from operator import itemgetter
 
-from tomlkit import aot, array, dump, inline_table, integer, load, table, TOMLDocument
-from tomlkit.items import Table
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11
+    tomllib = None
+
+from tomlkit import aot, array, dumps, inline_table, integer, load, table, TOMLDocument
+from tomlkit.items import Array, Table, Trivia
 
 from issai.core import *
 from issai.core.checks import verify_entity_attr_name, verify_master_data_attr, verify_master_data_type
@@ -108,13 +115,7 @@ class Entity(dict):
         :returns: the entity type name used in TOML files
         :rtype: str
         """
-        if self[ATTR_ENTITY_TYPE] == ENTITY_TYPE_PRODUCT:
-            return ENTITY_TYPE_NAME_PRODUCT
-        elif self[ATTR_ENTITY_TYPE] == ENTITY_TYPE_CASE:
-            return ENTITY_TYPE_NAME_CASE
-        elif self[ATTR_ENTITY_TYPE] == ENTITY_TYPE_PLAN:
-            return ENTITY_TYPE_NAME_PLAN
-        return ENTITY_TYPE_NAME_PLAN_RESULT
+        return _ENTITY_TYPE_TOML_NAMES.get(self[ATTR_ENTITY_TYPE], ENTITY_TYPE_NAME_PLAN_RESULT)
 
     def attachments(self):
         """
@@ -122,13 +123,13 @@ class Entity(dict):
         :rtype: dict
         """
         _attachments = {}
-        _attachments.update(self._attachments_for_part(TCMS_CLASS_ID_TEST_CASE, ATTR_TEST_CASES, ATTR_ATTACHMENTS))
-        _attachments.update(self._attachments_for_part(TCMS_CLASS_ID_TEST_PLAN, ATTR_TEST_PLANS, ATTR_ATTACHMENTS))
-        _attachments.update(self._attachments_for_part(TCMS_CLASS_ID_TEST_RUN, ATTR_TEST_RUNS, ATTR_ATTACHMENTS))
-        _attachments.update(self._attachments_for_part(TCMS_CLASS_ID_TEST_CASE, ATTR_TEST_CASE_RESULTS,
-                                                       ATTR_OUTPUT_FILES))
-        _attachments.update(self._attachments_for_part(TCMS_CLASS_ID_TEST_RUN, ATTR_TEST_PLAN_RESULTS,
-                                                       ATTR_OUTPUT_FILES))
+        self._add_attachments_for_part(_attachments, TCMS_CLASS_ID_TEST_CASE, ATTR_TEST_CASES, ATTR_ATTACHMENTS)
+        self._add_attachments_for_part(_attachments, TCMS_CLASS_ID_TEST_PLAN, ATTR_TEST_PLANS, ATTR_ATTACHMENTS)
+        self._add_attachments_for_part(_attachments, TCMS_CLASS_ID_TEST_RUN, ATTR_TEST_RUNS, ATTR_ATTACHMENTS)
+        self._add_attachments_for_part(_attachments, TCMS_CLASS_ID_TEST_CASE, ATTR_TEST_CASE_RESULTS,
+                                       ATTR_OUTPUT_FILES)
+        self._add_attachments_for_part(_attachments, TCMS_CLASS_ID_TEST_RUN, ATTR_TEST_PLAN_RESULTS,
+                                       ATTR_OUTPUT_FILES)
         return _attachments
 
     def attachment_count(self):
@@ -170,11 +171,7 @@ class Entity(dict):
         _count = 1 if ATTR_PRODUCT in self else 0
         if ATTR_MASTER_DATA in self:
             _count += self[ATTR_MASTER_DATA].object_count()
-        for _attr in (ATTR_TEST_CASES, ATTR_TEST_EXECUTIONS, ATTR_TEST_PLANS, ATTR_TEST_RUNS,
-                      ATTR_TEST_CASE_RESULTS, ATTR_TEST_PLAN_RESULTS):
-            if _attr in self:
-                _count += len(self[_attr])
-        return _count
+        return _count + sum(len(self.get(_attr, ())) for _attr in _COUNTED_PARTS)
 
     def attribute_value(self, attribute_name):
         """
@@ -245,7 +242,7 @@ class Entity(dict):
         _toml_data.append(ATTR_ENTITY_TYPE, self.entity_type_toml_name())
         _toml_data.append(ATTR_ENTITY_NAME, self.entity_name())
         _toml_data.append(ATTR_ENTITY_ID, integer(self.entity_id()))
-        return _merge_toml(_toml_data, self.to_toml(True))
+        return _append_toml(_toml_data, self.to_toml(True))
 
     def to_toml(self, include_references=False):
         """
@@ -265,8 +262,9 @@ class Entity(dict):
         """
         try:
             _toml_data = self.as_toml_entity()
-            with open(file_path, 'w') as _f:
-                dump(_toml_data, _f)
+            # TOML files are always UTF-8 encoded
+            with open(file_path, 'w', encoding='utf-8') as _f:
+                _f.write(dumps(_toml_data))
         except IssaiException:
             raise
         except Exception as _e:
@@ -282,8 +280,13 @@ class Entity(dict):
         :raises IssaiException: if the file could not be read
         """
         try:
-            with open(file_path, 'r') as _f:
-                return Entity.from_toml_entity(load(_f))
+            if tomllib is None:
+                with open(file_path, 'r') as _f:
+                    return Entity.from_toml_entity(load(_f))
+            # entities read from file are never written back in place, so the much faster parser without
+            # style preservation can be used
+            with open(file_path, 'rb') as _f:
+                return Entity.from_toml_entity(tomllib.load(_f))
         except IssaiException:
             raise
         except Exception as _e:
@@ -293,7 +296,7 @@ class Entity(dict):
     def from_toml_entity(toml_data):
         """
         Creates an entity from TOML data.
-        :param TOMLDocument toml_data: the entity's data in TOML format
+        :param TOMLDocument|dict toml_data: the entity's data in TOML format
         :returns: created entity object
         :rtype: Entity
         """
@@ -319,60 +322,72 @@ class Entity(dict):
         :rtype: int
         :raises IssaiException: if the type name is invalid
         """
-        if type_name == ENTITY_TYPE_NAME_PRODUCT:
-            return ENTITY_TYPE_PRODUCT
-        elif type_name == ENTITY_TYPE_NAME_CASE:
-            return ENTITY_TYPE_CASE
-        elif type_name == ENTITY_TYPE_NAME_PLAN:
-            return ENTITY_TYPE_PLAN
-        elif type_name == ENTITY_TYPE_NAME_PLAN_RESULT:
-            return ENTITY_TYPE_PLAN_RESULT
-        raise IssaiException(E_TOML_ENTITY_TYPE_INVALID, type_name)
+        _type_id = _ENTITY_TYPE_IDS.get(type_name)
+        if _type_id is None:
+            raise IssaiException(E_TOML_ENTITY_TYPE_INVALID, type_name)
+        return _type_id
 
     def fill_test_objects_data(self, test_object_type):
+        """
+        Converts all objects of specified group to TOML format.
+        :param str test_object_type: the group name
+        :returns: group objects in TOML format
+        :rtype: AoT
+        """
+        return self._objects_as_toml(test_object_type)
+
+    def _objects_as_toml(self, group_name):
+        """
+        Converts all objects of specified group to TOML format. Attributes without value are omitted, the objects
+        themselves are left unchanged.
+        :param str group_name: the group name
+        :returns: group objects in TOML format
+        :rtype: AoT
+        """
         _toml_data = aot()
-        for _obj in self[test_object_type].values():
+        for _obj in self[group_name].values():
             _valid_obj_data = table()
             for _k, _v in _obj.items():
                 if _v is None:
                     continue
-                if isinstance(_v, list):
-                    _make_inline = False
+                if isinstance(_v, list) and any(isinstance(_elem, dict) for _elem in _v):
+                    _a = array()
                     for _elem in _v:
-                        if isinstance(_elem, dict):
-                            _make_inline = True
-                            for _elem_k, _elem_v in list(_elem.items()):
-                                if _elem_v is None:
-                                    del _elem[_elem_k]
-                    if _make_inline:
-                        _a = array()
-                        for _elem in _v:
-                            _t = inline_table()
-                            _t.update(_elem)
-                            _a.append(_t)
-                        _valid_obj_data[_k] = _a
-                        continue
-                _valid_obj_data[_k] = _v
+                        _t = inline_table()
+                        _t.update({_elem_k: _elem_v for _elem_k, _elem_v in _elem.items() if _elem_v is not None})
+                        _a.append(_t)
+                    _v = _a
+                # keys are unique, append skips the check for an existing key done by item assignment
+                _valid_obj_data.append(_k, _v)
             _toml_data.append(_valid_obj_data)
         return _toml_data
 
-    def _attachments_for_part(self, class_id, part_name, attachment_attr_name):
+    def _all_objects_as_toml(self, group_names):
+        """
+        Converts the objects of all specified groups to TOML format in a single pass. Empty or missing groups are
+        omitted from the result.
+        :param tuple[str] group_names: the group names, in desired output order
+        :returns: group objects in TOML format, key group name, value group objects
+        :rtype: dict[str, AoT]
+        """
+        return {_group_name: self._objects_as_toml(_group_name)
+                for _group_name in group_names if len(self.get(_group_name, ())) > 0}
+
+    def _add_attachments_for_part(self, attachments, class_id, part_name, attachment_attr_name):
         """
-        Returns all attachment file URLs for a container part.
+        Adds all attachment file URLs for a container part to given dictionary.
+        :param dict attachments: the dictionary receiving the attachment file URLs, keyed by class ID and object ID
         :param int class_id: the TCMS class ID
         :param str part_name: the container part name
         :param str attachment_attr_name: the name of the attribute holding attachment file URLs
-        :returns: all attachment file URLs referenced by this container part
-        :rtype: dict
         """
-        _attachments = {}
         _part_objects = self.get(part_name)
-        if _part_objects is not None:
-            for _object_id, _object in _part_objects.items():
-                _object_attachments = _object.get(attachment_attr_name)
-                if isinstance(_object_attachments, list):
-                    _attachments[_object_id] = _object_attachments
-        return {} if len(_attachments) == 0 else {class_id: _attachments}
+        if _part_objects is None:
+            return
+        for _object_id, _object in _part_objects.items():
+            _object_attachments = _object.get(attachment_attr_name)
+            if isinstance(_object_attachments, list):
+                attachments.setdefault(class_id, {})[_object_id] = _object_attachments
 
     def _attachment_count_for_part(self, part_name, attachment_attr_name):
         """
@@ -382,10 +397,11 @@ class Entity(dict):
         :returns: number of attachment files
         :rtype: int
         """
-        if part_name not in self:
+        _part_objects = self.get(part_name)
+        if _part_objects is None:
             return 0
         _attachment_count = 0
-        for _object_id, _object in self[part_name].items():
+        for _object in _part_objects.values():
             _object_attachments = _object.get(attachment_attr_name)
             if isinstance(_object_attachments, list):
                 _attachment_count += len(_object_attachments)
@@ -433,24 +449,14 @@ class SpecificationEntity(Entity):
         :rtype: dict
         """
         _attachments = super().attachments()
-        for _a in self[ATTR_TEST_CASES].values():
-            _case_attachments = _a[ATTR_ATTACHMENTS]
+        for _case_id, _case in self[ATTR_TEST_CASES].items():
+            _case_attachments = _case[ATTR_ATTACHMENTS]
             if len(_case_attachments) > 0:
-                _class_dict = _attachments.get(TCMS_CLASS_ID_TEST_CASE)
-                if _class_dict is None:
-                    _attachments[TCMS_CLASS_ID_TEST_CASE] = {}
-                    _attachments[TCMS_CLASS_ID_TEST_CASE][_a[ATTR_ID]] = _case_attachments
-                else:
-                    _class_dict[_a[ATTR_ID]] = _case_attachments
-        for _a in self[ATTR_TEST_PLANS].values():
-            _plan_attachments = _a[ATTR_ATTACHMENTS]
+                _attachments.setdefault(TCMS_CLASS_ID_TEST_CASE, {})[_case_id] = _case_attachments
+        for _plan_id, _plan in self[ATTR_TEST_PLANS].items():
+            _plan_attachments = _plan[ATTR_ATTACHMENTS]
             if len(_plan_attachments) > 0:
-                _class_dict = _attachments.get(TCMS_CLASS_ID_TEST_PLAN)
-                if _class_dict is None:
-                    _attachments[TCMS_CLASS_ID_TEST_PLAN] = {}
-                    _attachments[TCMS_CLASS_ID_TEST_PLAN][_a[ATTR_ID]] = _plan_attachments
-                else:
-                    _class_dict[_a[ATTR_ID]] = _plan_attachments
+                _attachments.setdefault(TCMS_CLASS_ID_TEST_PLAN, {})[_plan_id] = _plan_attachments
         return _attachments
 
     def referenced_build_ids(self):
@@ -458,11 +464,8 @@ class SpecificationEntity(Entity):
         :returns: TCMS ID's of all builds used by test runs and executions
         :rtype: list
         """
-        _build_ids = set()
-        for _run in self[ATTR_TEST_RUNS].values():
-            _build_ids.add(_run[ATTR_BUILD])
-        for _execution in self[ATTR_TEST_EXECUTIONS].values():
-            _build_ids.add(_execution[ATTR_BUILD])
+        _build_ids = {_run[ATTR_BUILD] for _run in self[ATTR_TEST_RUNS].values()}
+        _build_ids.update(_execution[ATTR_BUILD] for _execution in self[ATTR_TEST_EXECUTIONS].values())
         return list(_build_ids)
 
     def referenced_case_status_ids(self):
@@ -470,61 +473,42 @@ class SpecificationEntity(Entity):
         :returns: TCMS ID's of all case statuses used by test cases
         :rtype: list
         """
-        _status_ids = set()
-        for _case in self[ATTR_TEST_CASES].values():
-            _status_ids.add(_case[ATTR_CASE_STATUS])
-        return list(_status_ids)
+        return list({_case[ATTR_CASE_STATUS] for _case in self[ATTR_TEST_CASES].values()})
 
     def referenced_category_ids(self):
         """
         :returns: TCMS ID's of all categories used by test cases
         :rtype: list
         """
-        _category_ids = set()
-        for _case in self[ATTR_TEST_CASES].values():
-            _category_ids.add(_case[ATTR_CATEGORY])
-        return list(_category_ids)
+        return list({_case[ATTR_CATEGORY] for _case in self[ATTR_TEST_CASES].values()})
 
     def referenced_component_ids(self):
         """
         :returns: TCMS ID's of all components used by test cases
         :rtype: list
         """
-        _component_ids = set()
-        for _case in self[ATTR_TEST_CASES].values():
-            for _c in _case[ATTR_COMPONENTS]:
-                _component_ids.add(_c)
-        return list(_component_ids)
+        return list({_c for _case in self[ATTR_TEST_CASES].values() for _c in _case[ATTR_COMPONENTS]})
 
     def referenced_execution_status_ids(self):
         """
         :returns: TCMS ID's of all execution statuses used by test executions
         :rtype: list
         """
-        _status_ids = set()
-        for _execution in self[ATTR_TEST_EXECUTIONS].values():
-            _status_ids.add(_execution[ATTR_STATUS])
-        return list(_status_ids)
+        return list({_execution[ATTR_STATUS] for _execution in self[ATTR_TEST_EXECUTIONS].values()})
 
     def referenced_plan_type_ids(self):
         """
         :returns: TCMS ID's of all plan types used by test plans
         :rtype: list
         """
-        _type_ids = set()
-        for _plan in self[ATTR_TEST_PLANS].values():
-            _type_ids.add(_plan[ATTR_TYPE])
-        return list(_type_ids)
+        return list({_plan[ATTR_TYPE] for _plan in self[ATTR_TEST_PLANS].values()})
 
     def referenced_priority_ids(self):
         """
         :returns: TCMS ID's of all priorities used by test cases
         :rtype: list
         """
-        _priority_ids = set()
-        for _case in self[ATTR_TEST_CASES].values():
-            _priority_ids.add(_case[ATTR_PRIORITY])
-        return list(_priority_ids)
+        return list({_case[ATTR_PRIORITY] for _case in self[ATTR_TEST_CASES].values()})
 
     def referenced_user_ids(self):
         """
@@ -533,18 +517,14 @@ class SpecificationEntity(Entity):
         :rtype: list
         """
         _user_ids = set(self[ATTR_MASTER_DATA].referenced_user_ids())
+        for _part_name, _attr_names in _USER_REFERENCING_PART_ATTRS:
+            _user_ids.update({_v for _part in self[_part_name].values() for _a in _attr_names
+                              if (_v := _part.get(_a)) is not None})
         for _case in self[ATTR_TEST_CASES].values():
-            _add_referenced_ids(_user_ids, _case, [ATTR_AUTHOR, ATTR_DEFAULT_TESTER, ATTR_REVIEWER])
             _case_hist = _case.get(ATTR_HISTORY)
             if _case_hist is not None:
-                for _hist_entry in _case_hist:
-                    _add_referenced_ids(_user_ids, _hist_entry, [ATTR_HISTORY_USER_ID])
-        for _execution in self[ATTR_TEST_EXECUTIONS].values():
-            _add_referenced_ids(_user_ids, _execution, [ATTR_ASSIGNEE, ATTR_TESTED_BY])
-        for _plan in self[ATTR_TEST_PLANS].values():
-            _add_referenced_ids(_user_ids, _plan, [ATTR_AUTHOR])
-        for _run in self[ATTR_TEST_RUNS].values():
-            _add_referenced_ids(_user_ids, _run, [ATTR_DEFAULT_TESTER, ATTR_MANAGER])
+                _user_ids.update({_v for _hist_entry in _case_hist
+                                  if (_v := _hist_entry.get(ATTR_HISTORY_USER_ID)) is not None})
         return list(_user_ids)
 
     def referenced_version_ids(self):
@@ -552,24 +532,21 @@ class SpecificationEntity(Entity):
         :returns: TCMS ID's of all versions used by test plans
         :rtype: list
         """
-        _version_ids = set()
-        for _plan in self[ATTR_TEST_PLANS].values():
-            _version_ids.add(_plan[ATTR_PRODUCT_VERSION])
-        return list(_version_ids)
+        return list({_plan[ATTR_PRODUCT_VERSION] for _plan in self[ATTR_TEST_PLANS].values()})
 
     def environments(self):
         """
         :returns: TCMS environments data stored in this entity
         :rtype: list
         """
-        return [_env for _env in self[ATTR_ENVIRONMENTS].values()]
+        return list(self[ATTR_ENVIRONMENTS].values())
 
     def test_plans(self):
         """
         :returns: TCMS test plans data stored in this entity
         :rtype: list
         """
-        return [_plan for _plan in self[ATTR_TEST_PLANS].values()]
+        return list(self[ATTR_TEST_PLANS].values())
 
     def execution_status_id_of(self, status_name):
         """
@@ -606,17 +583,19 @@ class SpecificationEntity(Entity):
         :param bool update_cases: indicates whether to update test case data from executions
         """
         if executions is not None:
+            _cases = self[ATTR_TEST_CASES]
+            _executions = self[ATTR_TEST_EXECUTIONS]
             for _execution in executions:
                 _execution_id = _execution[ATTR_ID]
                 _case_id = _execution[ATTR_CASE]
-                if _case_id not in self[ATTR_TEST_CASES]:
+                _case = _cases.get(_case_id)
+                if _case is None:
                     print(f'Test case {_case_id} for execution {_execution_id} not found, execution ignored')
                     continue
-                self[ATTR_TEST_EXECUTIONS][_execution_id] = _execution
+                _executions[_execution_id] = _execution
                 if update_cases:
-                    _run_id = _execution[ATTR_RUN]
-                    self[ATTR_TEST_CASES][_case_id][ATTR_RUN] = _run_id
-                    self[ATTR_TEST_CASES][_case_id][ATTR_EXECUTION] = _execution_id
+                    _case[ATTR_RUN] = _execution[ATTR_RUN]
+                    _case[ATTR_EXECUTION] = _execution_id
 
     def add_tcms_plans(self, plans):
         """
@@ -633,11 +612,12 @@ class SpecificationEntity(Entity):
         :param list runs: the TCMS test runs data
         """
         if runs is not None:
+            _runs = self[ATTR_TEST_RUNS]
+            _plans = self[ATTR_TEST_PLANS]
             for _run in runs:
                 _run_id = _run[ATTR_ID]
-                _plan_id = _run[ATTR_PLAN]
-                self[ATTR_TEST_RUNS][_run_id] = _run
-                self[ATTR_TEST_PLANS][_plan_id][ATTR_RUN] = _run_id
+                _runs[_run_id] = _run
+                _plans[_run[ATTR_PLAN]][ATTR_RUN] = _run_id
 
     def replace_attribute(self, class_id, object_id, replacement_value):
         """
@@ -658,16 +638,11 @@ class SpecificationEntity(Entity):
                     del _objects[object_id]
                 _objects[_new_object_id] = replacement_value
         # eventually update references
-        _references_desc = CLASS_REFERENCES.get(class_id)
-        if _references_desc is not None:
-            for _tcms_class_id, _attrs in _references_desc.items():
-                _entity_data_type = data_type_for_tcms_class(_tcms_class_id)
-                if _entity_data_type is None:
-                    continue
-                _entity_objects = self.get(_entity_data_type)
-                if _entity_objects is None:
-                    continue
-                _replace_references(_entity_objects, _attrs, object_id, _new_object_id)
+        for _data_type, _attrs in _ENTITY_PART_REFERENCES.get(class_id, ()):
+            _entity_objects = self.get(_data_type)
+            if _entity_objects is None:
+                continue
+            _replace_references(_entity_objects, _attrs, object_id, _new_object_id)
         self[ATTR_MASTER_DATA].replace_object(class_id, object_id, replacement_value)
 
     def fill_product_data(self, product):
@@ -683,17 +658,8 @@ class SpecificationEntity(Entity):
         """
         _entity_data = table()
         _entity_data.append(ATTR_MASTER_DATA, self[ATTR_MASTER_DATA].to_toml())
-        _entity_data[ATTR_PRODUCT] = _merge_toml(table(), self[ATTR_PRODUCT])
-        if len(self[ATTR_ENVIRONMENTS]) > 0:
-            _entity_data[ATTR_ENVIRONMENTS] = self.fill_test_objects_data(ATTR_ENVIRONMENTS)
-        if len(self[ATTR_TEST_PLANS]) > 0:
-            _entity_data[ATTR_TEST_PLANS] = self.fill_test_objects_data(ATTR_TEST_PLANS)
-        if len(self[ATTR_TEST_RUNS]) > 0:
-            _entity_data[ATTR_TEST_RUNS] = self.fill_test_objects_data(ATTR_TEST_RUNS)
-        if len(self[ATTR_TEST_CASES]) > 0:
-            _entity_data[ATTR_TEST_CASES] = self.fill_test_objects_data(ATTR_TEST_CASES)
-        if len(self[ATTR_TEST_EXECUTIONS]) > 0:
-            _entity_data[ATTR_TEST_EXECUTIONS] = self.fill_test_objects_data(ATTR_TEST_EXECUTIONS)
+        _entity_data[ATTR_PRODUCT] = _append_toml(table(), self[ATTR_PRODUCT])
+        _entity_data.update(self._all_objects_as_toml(_SPEC_TOML_GROUPS))
         return _entity_data
 
     def fill_from_toml(self, toml_data):
@@ -787,6 +753,28 @@ class TestPlanEntity(SpecificationEntity):
         :param str plan_name: the test plan name
         """
         super().__init__(ENTITY_TYPE_PLAN, plan_id, plan_name)
+        # IDs of direct child plans, key parent plan ID; built on first use
+        self._plan_children = None
+
+    def add_tcms_plans(self, plans):
+        """
+        Adds the specified test plans.
+        :param list plans: the TCMS test plans data
+        """
+        super().add_tcms_plans(plans)
+        self._plan_children = None
+
+    def replace_attribute(self, class_id, object_id, replacement_value):
+        """
+        Replaces an attribute, because it doesn't exist in TCMS or another object shall be used instead.
+        Updates all references to the replaced object to match the replacement.
+        :param int class_id: the TCMS class ID
+        :param int object_id: the TCMS object ID
+        :param dict replacement_value: the new attribute value
+        """
+        super().replace_attribute(class_id, object_id, replacement_value)
+        if class_id == TCMS_CLASS_ID_TEST_PLAN:
+            self._plan_children = None
 
     def plan_child_ids(self, plan_id):
         """
@@ -796,8 +784,12 @@ class TestPlanEntity(SpecificationEntity):
         :rtype: list
         :raises IssaiException: if entity data is inconsistent
         """
+        if self._plan_children is None:
+            self._plan_children = {}
+            for _plan_id, _plan in self[ATTR_TEST_PLANS].items():
+                self._plan_children.setdefault(_plan.get(ATTR_PARENT), []).append(_plan_id)
         _parent_id = self.entity_id() if plan_id < 0 else plan_id
-        return [_c[ATTR_ID] for _c in self[ATTR_TEST_PLANS].values() if _c.get(ATTR_PARENT) == _parent_id]
+        return list(self._plan_children.get(_parent_id, ()))
 
     def runnable_case_count(self):
         """
@@ -805,15 +797,9 @@ class TestPlanEntity(SpecificationEntity):
         :returns: number of runnable test cases
         :rtype: int
         """
-        _case_count = 0
-        for _plan in self[ATTR_TEST_PLANS].values():
-            if not _plan[ATTR_IS_ACTIVE]:
-                continue
-            for _case_id in _plan[ATTR_CASES]:
-                if not self[ATTR_TEST_CASES][_case_id][ATTR_IS_AUTOMATED]:
-                    continue
-                _case_count += 1
-        return _case_count
+        _cases = self[ATTR_TEST_CASES]
+        return sum(1 for _plan in self[ATTR_TEST_PLANS].values() if _plan[ATTR_IS_ACTIVE]
+                   for _case_id in _plan[ATTR_CASES] if _cases[_case_id][ATTR_IS_AUTOMATED])
 
     def get_plan_properties(self, plan, property_patterns):
         """
@@ -894,13 +880,10 @@ class ResultEntity(Entity):
         _objects = toml_data.get(group_name)
         if _objects is None:
             return
+        _group = self[group_name]
         for _object in _objects:
-            _object_id = _object[object_key]
             # TODO check attribute names and types
-            if _object_id not in self[group_name]:
-                self[group_name][_object_id] = {}
-            for _k, _v in _object.items():
-                self[group_name][_object_id][_k] = python_value(_v)
+            _group.setdefault(_object[object_key], {}).update({_k: python_value(_v) for _k, _v in _object.items()})
 
 
 class PlanResultEntity(ResultEntity):
@@ -927,21 +910,29 @@ class PlanResultEntity(ResultEntity):
         :rtype: dict
         """
         _attachments = super().attachments()
-        _attachments[TCMS_CLASS_ID_TEST_RUN] = {}
-        _attachments[TCMS_CLASS_ID_TEST_RUN][self.entity_id()] = self.output_files()
+        _attachments[TCMS_CLASS_ID_TEST_RUN] = self.output_files()
         return _attachments
 
+    def run_for_execution(self, execution_id):
+        """
+        Returns ID of the test run containing specified test execution.
+        :param int execution_id: the TCMS test execution ID
+        :returns: TCMS test run ID
+        :rtype: int
+        :raises IssaiException: if no test plan result contains a result for the execution
+        """
+        for _run_id, _plan_result in self[ATTR_TEST_PLAN_RESULTS].items():
+            if execution_id in _plan_result.get(ATTR_CASE_RESULTS, []):
+                return _run_id
+        raise IssaiException(E_UNKNOWN_ENTITY_PART, self.entity_name(), ATTR_TEST_CASE_RESULTS, execution_id)
+
     def output_files(self):
         """
         :returns: all output files associated with any test plan result; key test run ID, value file names
         :rtype: dict
         """
-        _files = {}
-        for _run_id, _plan_result in self[ATTR_TEST_PLAN_RESULTS].items():
-            _run_files = _plan_result.get(ATTR_OUTPUT_FILES)
-            if _run_files is not None and len(_run_files) > 0:
-                _files[_run_id] = _run_files
-        return _files
+        return {_run_id: _run_files for _run_id, _plan_result in self[ATTR_TEST_PLAN_RESULTS].items()
+                if (_run_files := _plan_result.get(ATTR_OUTPUT_FILES))}
 
     def to_toml(self, include_references=False):
         """
@@ -956,11 +947,8 @@ class PlanResultEntity(ResultEntity):
         """
         _entity_data = table()
         _entity_data[ATTR_MASTER_DATA] = self[ATTR_MASTER_DATA].to_toml()
-        _entity_data[ATTR_PRODUCT] = _merge_toml(table(), self[ATTR_PRODUCT])
-        if len(self[ATTR_TEST_CASE_RESULTS]) > 0:
-            _entity_data[ATTR_TEST_CASE_RESULTS] = self.fill_test_objects_data(ATTR_TEST_CASE_RESULTS)
-        if len(self[ATTR_TEST_PLAN_RESULTS]) > 0:
-            _entity_data[ATTR_TEST_PLAN_RESULTS] = self.fill_test_objects_data(ATTR_TEST_PLAN_RESULTS)
+        _entity_data[ATTR_PRODUCT] = _append_toml(table(), self[ATTR_PRODUCT])
+        _entity_data.update(self._all_objects_as_toml(_RESULT_TOML_GROUPS))
         return _entity_data
 
     @staticmethod
@@ -992,17 +980,17 @@ class PlanResultEntity(ResultEntity):
         _plan_result_entity = PlanResultEntity(_plan_entity_id, _plan_name)
         _plan_result_entity[ATTR_PRODUCT] = plan_entity[ATTR_PRODUCT].copy()
         _plan_result_entity[ATTR_MASTER_DATA] = plan_entity[ATTR_MASTER_DATA]
+        _case_results = _plan_result_entity[ATTR_TEST_CASE_RESULTS]
+        _plan_results = _plan_result_entity[ATTR_TEST_PLAN_RESULTS]
         for _pr in core_result.plan_results():
-            _plan_id = _pr[ATTR_PLAN]
-            _epr = _pr.copy()
-            _epr[ATTR_CASE_RESULTS] = []
+            _case_ids = []
             for _cr in _pr[ATTR_CASE_RESULTS]:
-                del _cr[ATTR_MATRIX_CODE]
+                # matrix code is only used during test execution, core result is left unchanged
                 _case_id = _cr[ATTR_CASE]
-                _plan_result_entity[ATTR_TEST_CASE_RESULTS][_case_id] = _cr.copy()
-                _epr[ATTR_CASE_RESULTS].append(_case_id)
-            _epr[ATTR_CHILD_PLAN_RESULTS] = [_cpr[ATTR_PLAN] for _cpr in _pr[ATTR_CHILD_PLAN_RESULTS]]
-            _plan_result_entity[ATTR_TEST_PLAN_RESULTS][_plan_id] = _epr
+                _case_results[_case_id] = {_k: _v for _k, _v in _cr.items() if _k != ATTR_MATRIX_CODE}
+                _case_ids.append(_case_id)
+            _child_ids = [_cpr[ATTR_PLAN] for _cpr in _pr[ATTR_CHILD_PLAN_RESULTS]]
+            _plan_results[_pr[ATTR_PLAN]] = {**_pr, ATTR_CASE_RESULTS: _case_ids, ATTR_CHILD_PLAN_RESULTS: _child_ids}
         return _plan_result_entity
 
 
@@ -1018,13 +1006,19 @@ class MasterData(dict):
         super().__init__()
         for _mtype in MASTER_DATA_TYPES:
             self[_mtype] = {}
+        # lowercase name to ID index for execution statuses, lowercase names are kept per status ID
+        self._execution_status_ids = {}
+        self._execution_status_names = {}
+        # references between master data objects, key (TCMS class ID, object ID) of the referenced object,
+        # value list of (referencing object, attribute name); built on first replace
+        self._reference_index = None
 
     def object_count(self):
         """
         :returns: number of essential objects in master data
         :rtype: int
         """
-        return sum([len(_object) for _object in self.values()])
+        return sum(map(len, self.values()))
 
     def object(self, data_type, object_id):
         """
@@ -1035,10 +1029,10 @@ class MasterData(dict):
         :rtype: dict
         :raises IssaiException: if specified data type is not allowed
         """
-        _objects = self.get(data_type)
-        if _objects is None:
+        try:
+            return self[data_type].get(object_id)
+        except KeyError:
             raise IssaiException(E_INTERNAL_ERROR, localized_message(E_NOT_MASTER_DATA_CLASS, data_type))
-        return _objects.get(object_id)
 
     def objects_of_type(self, data_type):
         """
@@ -1050,7 +1044,7 @@ class MasterData(dict):
         """
         if data_type not in MASTER_DATA_TYPES:
             raise IssaiException(E_INTERNAL_ERROR, localized_message(E_NOT_MASTER_DATA_CLASS, data_type))
-        return [_obj for _obj in self[data_type].values()]
+        return list(self[data_type].values())
 
     def objects_of_class(self, class_id):
         """
@@ -1072,28 +1066,31 @@ class MasterData(dict):
         :param dict|list value: the object value(s)
         :raises IssaiException: if specified data type is not allowed
         """
-        value = copy.deepcopy(value)
+        if isinstance(value, dict):
+            value = [value]
+        value = [_master_data_object_copy(_v) for _v in value]
+        self._reference_index = None
         if data_type == ATTR_CASE_COMPONENTS:
             # special case components, where attribute cases is a set
-            # no need to distinguish value type here, always called with a list
+            _components = self[ATTR_CASE_COMPONENTS]
             for _component in value:
                 _component_id = _component[ATTR_ID]
                 _case_ids = _component[ATTR_CASES]
-                _stored_component = self[ATTR_CASE_COMPONENTS].get(_component_id)
+                _stored_component = _components.get(_component_id)
                 if _stored_component is None:
-                    _component[ATTR_CASES] = set(_component[ATTR_CASES])
-                    self[ATTR_CASE_COMPONENTS][_component_id] = _component
+                    _component[ATTR_CASES] = set(_case_ids)
+                    _components[_component_id] = _component
                 else:
                     for _case_id in _case_ids:
                         if _case_id is not None:
                             _stored_component[ATTR_CASES].add(_case_id)
             return
         if data_type in MASTER_DATA_TYPES:
-            if isinstance(value, dict):
-                self[data_type][value[ATTR_ID]] = value
-            else:
-                for _v in value:
-                    self[data_type][_v[ATTR_ID]] = _v
+            _objects = self[data_type]
+            for _v in value:
+                _objects[_v[ATTR_ID]] = _v
+            if data_type == ATTR_EXECUTION_STATUSES:
+                self._update_execution_status_index(value)
             return
         raise IssaiException(E_INTERNAL_ERROR, localized_message(E_NOT_MASTER_DATA_CLASS, data_type))
 
@@ -1109,22 +1106,38 @@ class MasterData(dict):
         _new_object_id = replacement_value[ATTR_ID]
         # eventually update object in data type
         # TODO check whether another object with new_object_id already exists !
-        if class_id in MASTER_DATA_TYPE_TCMS_CLASS_IDS:
+        if is_master_data_tcms_class(class_id):
             # object is part of master data
             _objects = self.objects_of_class(class_id)
             if object_id in _objects:
                 del _objects[object_id]
             _objects[_new_object_id] = replacement_value
+            if class_id in _MASTER_DATA_REFERENCING_CLASS_IDS:
+                # references held by the replaced object itself have changed
+                self._reference_index = None
         # eventually update references
-        _references_desc = CLASS_REFERENCES.get(class_id)
-        if _references_desc is not None:
-            for _tcms_class_id, _attrs in _references_desc.items():
-                _entity_data_type = master_data_type_for_tcms_class(_tcms_class_id)
-                if _entity_data_type is None:
-                    # referencing class is not a master data class
-                    continue
-                _entity_objects = self.get(_entity_data_type)
-                _replace_references(_entity_objects, _attrs, object_id, _new_object_id)
+        _reference_index = self._references()
+        _references = _reference_index.pop((class_id, object_id), None)
+        if _references is not None:
+            for _object_value, _attr in _references:
+                _replace_reference(_object_value, _attr, object_id, _new_object_id)
+            _reference_index.setdefault((class_id, _new_object_id), []).extend(_references)
+        if class_id == TCMS_CLASS_ID_TEST_EXECUTION_STATUS:
+            self._update_execution_status_index([replacement_value], object_id)
+
+    def _references(self):
+        """
+        Returns the index of all references between master data objects, builds it if necessary.
+        :returns: references, key (TCMS class ID, object ID) of referenced object,
+                  value list of (referencing object, attribute name)
+        :rtype: dict
+        """
+        if self._reference_index is None:
+            self._reference_index = {}
+            for _class_id, _references_desc in _MASTER_DATA_REFERENCES.items():
+                for _data_type, _attrs in _references_desc:
+                    _add_references(self._reference_index, _class_id, self[_data_type], _attrs)
+        return self._reference_index
 
     def user_ids(self):
         """
@@ -1138,17 +1151,15 @@ class MasterData(dict):
         :returns: all TCMS usernames contained in master data
         :rtype: list
         """
-        return [_u[ATTR_USERNAME] for _u in self[ATTR_TCMS_USERS].values()]
+        return list(map(itemgetter(ATTR_USERNAME), self[ATTR_TCMS_USERS].values()))
 
     def referenced_user_ids(self):
         """
         :returns: TCMS ID's of all users referenced by master data
         :rtype: list
         """
-        _user_ids = set()
-        for _component in self[ATTR_CASE_COMPONENTS].values():
-            _add_referenced_ids(_user_ids, _component, [ATTR_INITIAL_OWNER, ATTR_INITIAL_QA_CONTACT])
-        return list(_user_ids)
+        return list({_v for _component in self[ATTR_CASE_COMPONENTS].values()
+                     for _a in _COMPONENT_USER_ATTRS if (_v := _component.get(_a)) is not None})
 
     def execution_status_id_of(self, status_name):
         """
@@ -1158,11 +1169,10 @@ class MasterData(dict):
         :rtype: int
         :raises IssaiException: if status name is unknown
         """
-        _lower_status_name = status_name.lower()
-        for _es in self[ATTR_EXECUTION_STATUSES].values():
-            if _lower_status_name == _es[ATTR_NAME].lower():
-                return _es[ATTR_ID]
-        raise IssaiException(E_CFG_INVALID_EXECUTION_STATUS, status_name)
+        _status_id = self._execution_status_ids.get(status_name.lower())
+        if _status_id is None:
+            raise IssaiException(E_CFG_INVALID_EXECUTION_STATUS, status_name)
+        return _status_id
 
     def to_toml(self):
         """
@@ -1172,16 +1182,14 @@ class MasterData(dict):
         _master_data = table()
         for _type_key, _type_values in self.items():
             if len(_type_values) > 0:
-                _values_data = array().multiline(True)
+                _elems_data = []
                 for _elem in _type_values.values():
                     _elem_data = inline_table()
                     for _elem_key, _elem_value in _elem.items():
-                        if isinstance(_elem_value, set):
-                            _elem_data.append(_elem_key, list(_elem_value))
-                        else:
-                            _elem_data.append(_elem_key, _elem_value)
-                    _values_data.append(_elem_data)
-                _master_data.append(_type_key, _values_data)
+                        _elem_data.append(_elem_key, list(_elem_value) if isinstance(_elem_value, set) else _elem_value)
+                    _elems_data.append(_elem_data)
+                # build the array in one step, appending element by element re-indexes the whole array each time
+                _master_data.append(_type_key, Array(_elems_data, Trivia(), multiline=True))
         return _master_data
 
     @staticmethod
@@ -1196,67 +1204,107 @@ class MasterData(dict):
         _master_data = MasterData()
         for _md_type, _md_value in toml_data.items():
             verify_master_data_type(_md_type, _md_value)
-            _master_data[_md_type] = {}
+            _objects = {}
             for _elem in _md_value:
-                _elem_value = {}
-                for _attr_name, _attr_value in _elem.items():
-                    _elem_value[_attr_name] = verify_master_data_attr(_md_type, _attr_name, _attr_value)
-                _master_data[_md_type][_elem_value[ATTR_ID]] = _elem_value
+                _elem_value = {_attr_name: verify_master_data_attr(_md_type, _attr_name, _attr_value)
+                               for _attr_name, _attr_value in _elem.items()}
+                _objects[_elem_value[ATTR_ID]] = _elem_value
+            _master_data[_md_type] = _objects
+        _master_data._update_execution_status_index(_master_data[ATTR_EXECUTION_STATUSES].values())
         return _master_data
 
+    def _update_execution_status_index(self, added_statuses, removed_status_id=None):
+        """
+        Updates the index to look up execution status IDs by lowercase status name.
+        Lowercase names are computed once for added statuses only. They are not stored in the status objects
+        themselves, because those are written unchanged to TOML files.
+        If several statuses share the same name, the first one takes precedence.
+        :param Iterable[dict] added_statuses: the execution statuses added to master data
+        :param int removed_status_id: the ID of an execution status removed from master data
+        """
+        if removed_status_id is not None:
+            self._execution_status_names.pop(removed_status_id, None)
+        for _es in added_statuses:
+            self._execution_status_names[_es[ATTR_ID]] = _es[ATTR_NAME].lower()
+        self._execution_status_ids = {}
+        for _status_id, _lower_status_name in self._execution_status_names.items():
+            self._execution_status_ids.setdefault(_lower_status_name, _status_id)
 
-def _add_referenced_ids(id_set, entity, attribute_names):
+
+def _master_data_object_copy(master_data_object):
     """
-    Adds IDs of referenced objects to given set, if the referencing attribute exists in the specified entity and has
-    a value.
-    :param set id_set: the result receiving all IDs found
-    :param dict entity: the entity that may hold references
-    :param list[str] attribute_names: names of all attributes in the entity that can hold references
+    Returns a copy of a master data object. Master data objects only hold scalar values and lists of scalar values,
+    so copying the lists is sufficient to make the copy independent of the original.
+    :param dict master_data_object: the master data object
+    :returns: copy of the master data object
+    :rtype: dict
     """
-    for _a in attribute_names:
-        _v = entity.get(_a)
-        if _v is not None:
-            id_set.add(_v)
+    return {_k: list(_v) if isinstance(_v, list) else _v for _k, _v in master_data_object.items()}
 
 
-def _replace_references(_entity_objects, _attrs, object_id, _new_object_id):
-    for _object_value in _entity_objects.values():
-        for _attr in _attrs:
+def _add_references(reference_index, class_id, objects, attribute_names):
+    """
+    Adds the references to objects of specified TCMS class held by given objects to a reference index.
+    :param dict reference_index: the index receiving the references
+    :param int class_id: the TCMS class ID of the referenced objects
+    :param dict objects: the objects that may hold references
+    :param list[str] attribute_names: names of all attributes in the objects that can hold references
+    """
+    for _object_value in objects.values():
+        for _attr in attribute_names:
             _ref_value = _object_value.get(_attr)
-            if _ref_value is None:
-                continue
             if isinstance(_ref_value, int):
-                if _ref_value == object_id:
-                    _object_value[_attr] = _new_object_id
-                continue
-            if isinstance(_ref_value, list):
-                try:
-                    _list_index = _ref_value.index(object_id)
-                    _object_value[_attr][_list_index] = _new_object_id
-                except ValueError:
-                    pass
+                reference_index.setdefault((class_id, _ref_value), []).append((_object_value, _attr))
+            elif isinstance(_ref_value, list):
+                for _ref_id in set(_ref_value):
+                    reference_index.setdefault((class_id, _ref_id), []).append((_object_value, _attr))
+
+
+def _replace_reference(object_value, attribute_name, object_id, new_object_id):
+    """
+    Replaces a reference to an object with a reference to another object.
+    :param dict object_value: the object holding the reference
+    :param str attribute_name: the name of the attribute holding the reference
+    :param int object_id: the ID of the referenced object
+    :param int new_object_id: the ID of the replacement object
+    """
+    _ref_value = object_value.get(attribute_name)
+    if _ref_value == object_id:
+        object_value[attribute_name] = new_object_id
+    elif isinstance(_ref_value, list) and object_id in _ref_value:
+        _ref_value[_ref_value.index(object_id)] = new_object_id
 
 
-def _merge_toml(ensemble, part):
+def _replace_references(entity_objects, attribute_names, object_id, new_object_id):
     """
-    Merges specified part into given whole object.
-    :param Entity ensemble: the whole object
-    :param dict part: the part to merge into the ensemble
-    :returns: whole object
-    :rtype: Entity
+    Replaces all references to an object held by given objects with references to another object.
+    :param dict entity_objects: the objects that may hold references
+    :param list[str] attribute_names: names of all attributes in the objects that can hold references
+    :param int object_id: the ID of the referenced object
+    :param int new_object_id: the ID of the replacement object
     """
-    if part is not None:
-        _valid_parts = {}
-        for _k, _v in part.items():
+    for _object_value in entity_objects.values():
+        for _attr in attribute_names:
+            _ref_value = _object_value.get(_attr)
+            if _ref_value == object_id:
+                _object_value[_attr] = new_object_id
+            elif isinstance(_ref_value, list) and object_id in _ref_value:
+                _ref_value[_ref_value.index(object_id)] = new_object_id
+
+
+def _append_toml(toml_container, data):
+    """
+    Appends all attributes with a value from specified data to given TOML container.
+    :param Container toml_container: the TOML table or document
+    :param dict data: the attributes to append; may be None
+    :returns: the TOML container
+    :rtype: Container
+    """
+    if data is not None:
+        for _k, _v in data.items():
             if _v is not None:
-                _valid_parts[_k] = _v
-        for _k, _v in _valid_parts.items():
-            _ensemble_value = ensemble.get(_k)
-            if _ensemble_value is None:
-                ensemble[_k] = _v
-            else:
-                _ensemble_value.append(_v)
-    return ensemble
+                toml_container.append(_k, _v)
+    return toml_container
 
 
 def read_toml_value(toml_data, key, required_data_type, mandatory=False):
@@ -1287,20 +1335,22 @@ def _matching_properties(properties, property_patterns):
     :returns: all matching properties
     :rtype: dict
     """
-    if len(property_patterns) == 0 or properties is None:
+    if properties is None or len(property_patterns) == 0:
         return {}
-    _matches = {}
-    for _prop in properties:
-        for _k in _prop.keys():
-            if property_patterns is None:
-                _matches[_k] = _prop.get(_k)
-                continue
-            for _pattern in property_patterns:
-                if re.match(_k, _pattern) is None:
-                    continue
-                _matches[_k] = _prop.get(_k)
-                break
-    return _matches
+    _pattern = _combined_pattern(tuple(sorted(property_patterns)))
+    return {_k: _v for _prop in properties for _k, _v in _prop.items() if _pattern.match(_k) is not None}
+
+
+@functools.lru_cache(maxsize=128)
+def _combined_pattern(property_patterns):
+    """
+    Returns a compiled regular expression matching if at least one of the property patterns matches.
+    Results are cached, because the same patterns are used for all test cases and test plans in an entity.
+    :param tuple property_patterns: the regular expression patterns, sorted
+    :returns: compiled regular expression
+    :rtype: re.Pattern
+    """
+    return re.compile('|'.join(f'(?:{_p})' for _p in property_patterns))
 
 
 CLASS_REFERENCES = {TCMS_CLASS_ID_BUILD: {TCMS_CLASS_ID_TEST_EXECUTION: [ATTR_BUILD],
@@ -1332,6 +1382,46 @@ CLASS_REFERENCES = {TCMS_CLASS_ID_BUILD: {TCMS_CLASS_ID_TEST_EXECUTION: [ATTR_BU
                     TCMS_CLASS_ID_VERSION: {TCMS_CLASS_ID_BUILD: [ATTR_VERSION],
                                             TCMS_CLASS_ID_TEST_PLAN: [ATTR_PRODUCT_VERSION]}}
 
-MASTER_DATA_TYPES = {ATTR_CASE_CATEGORIES, ATTR_CASE_COMPONENTS, ATTR_CASE_PRIORITIES, ATTR_CASE_STATUSES,
-                     ATTR_EXECUTION_STATUSES, ATTR_PLAN_TYPES, ATTR_PRODUCT_BUILDS, ATTR_PRODUCT_CLASSIFICATIONS,
-                     ATTR_PRODUCT_VERSIONS, ATTR_TCMS_USERS}
+# Entity type names used in TOML files
+_ENTITY_TYPE_TOML_NAMES = {ENTITY_TYPE_PRODUCT: ENTITY_TYPE_NAME_PRODUCT,
+                           ENTITY_TYPE_CASE: ENTITY_TYPE_NAME_CASE,
+                           ENTITY_TYPE_PLAN: ENTITY_TYPE_NAME_PLAN,
+                           ENTITY_TYPE_PLAN_RESULT: ENTITY_TYPE_NAME_PLAN_RESULT}
+_ENTITY_TYPE_IDS = {_name: _type_id for _type_id, _name in _ENTITY_TYPE_TOML_NAMES.items()}
+
+# Entity parts counted as essential objects
+_COUNTED_PARTS = (ATTR_TEST_CASES, ATTR_TEST_EXECUTIONS, ATTR_TEST_PLANS, ATTR_TEST_RUNS, ATTR_TEST_CASE_RESULTS,
+                  ATTR_TEST_PLAN_RESULTS)
+
+# Groups of test objects written to TOML files, in output order
+_SPEC_TOML_GROUPS = (ATTR_ENVIRONMENTS, ATTR_TEST_PLANS, ATTR_TEST_RUNS, ATTR_TEST_CASES, ATTR_TEST_EXECUTIONS)
+_RESULT_TOML_GROUPS = (ATTR_TEST_CASE_RESULTS, ATTR_TEST_PLAN_RESULTS)
+
+# TCMS classes of master data objects holding references to other master data objects
+_MASTER_DATA_REFERENCING_CLASS_IDS = {_c for _refs in CLASS_REFERENCES.values() for _c in _refs.keys()
+                                      if is_master_data_tcms_class(_c)}
+
+# References held by master data objects, key TCMS class ID of referenced objects,
+# value list of (master data type, attribute names) of referencing objects
+_MASTER_DATA_REFERENCES = {_c: [(master_data_type_for_tcms_class(_rc), _attrs) for _rc, _attrs in _refs.items()
+                                if is_master_data_tcms_class(_rc)]
+                           for _c, _refs in CLASS_REFERENCES.items()}
+
+# References held by test entity parts, key TCMS class ID of referenced objects,
+# value list of (entity part name, attribute names) of referencing objects
+_ENTITY_PART_REFERENCES = {_c: [(data_type_for_tcms_class(_rc), _attrs) for _rc, _attrs in _refs.items()
+                                if data_type_for_tcms_class(_rc) is not None]
+                           for _c, _refs in CLASS_REFERENCES.items()}
+
+# Test entity parts and their attributes holding references to TCMS users
+_USER_REFERENCING_PART_ATTRS = ((ATTR_TEST_CASES, (ATTR_AUTHOR, ATTR_DEFAULT_TESTER, ATTR_REVIEWER)),
+                                (ATTR_TEST_EXECUTIONS, (ATTR_ASSIGNEE, ATTR_TESTED_BY)),
+                                (ATTR_TEST_PLANS, (ATTR_AUTHOR,)),
+                                (ATTR_TEST_RUNS, (ATTR_DEFAULT_TESTER, ATTR_MANAGER)))
+
+# Component attributes holding references to TCMS users
+_COMPONENT_USER_ATTRS = (ATTR_INITIAL_OWNER, ATTR_INITIAL_QA_CONTACT)
+
+MASTER_DATA_TYPES = frozenset({ATTR_CASE_CATEGORIES, ATTR_CASE_COMPONENTS, ATTR_CASE_PRIORITIES, ATTR_CASE_STATUSES,
+                               ATTR_EXECUTION_STATUSES, ATTR_PLAN_TYPES, ATTR_PRODUCT_BUILDS,
+                               ATTR_PRODUCT_CLASSIFICATIONS, ATTR_PRODUCT_VERSIONS, ATTR_TCMS_USERS})
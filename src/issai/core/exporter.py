@@ -36,7 +36,7 @@
 Functions to export entities from TCMS to files.
 """
 
-from issai.core.attachments import download_attachments
+from issai.core.attachments import start_attachment_downloads, wait_for_attachment_downloads
 from issai.core.entities import ProductEntity, TestCaseEntity, TestPlanEntity
 from issai.core.task import TaskResult
 from issai.core.tcms import *
@@ -90,9 +90,7 @@ def export_case(case, options, output_path, task_monitor):
         _export_entity.add_tcms_executions(read_tcms_executions(_builds, _include_history, _cases))
 
     _fetch_referenced_master_data(_export_entity, task_monitor)
-    if _include_attachments:
-        download_attachments(_export_entity, output_path, task_monitor)
-    _write_output_file(_export_entity, os.path.join(output_path, f'testcase_{_case_id}.toml'), task_monitor)
+    _write_output(_export_entity, output_path, f'testcase_{_case_id}.toml', _include_attachments, task_monitor)
 
     return TaskResult(0, localized_message(I_GUI_EXPORT_CASE_SUCCESSFUL, _case_name))
 
@@ -126,37 +124,48 @@ def export_plan(plan, options, output_path, task_monitor):
         _op_count += 1
     _plan_id = plan[ATTR_ID]
     _plan_name = plan[ATTR_NAME]
-    _plan = read_test_entity_with_id(ENTITY_TYPE_PLAN, _plan_id)
-    _product = read_product_for_test_entity(ENTITY_TYPE_PLAN, _plan)
-    _export_entity = TestPlanEntity(_plan[ATTR_ID], _plan[ATTR_NAME])
-    _export_entity.fill_product_data(_product)
-    _classification = find_tcms_object(TCMS_CLASS_ID_CLASSIFICATION, {ATTR_ID: _product[ATTR_CLASSIFICATION]})
-    _export_entity.add_master_data(ATTR_PRODUCT_CLASSIFICATIONS, _classification)
+    _requests = []
+    _environments = None
+    if options.get(OPTION_INCLUDE_ENVIRONMENTS):
+        _environments = submit_tcms_request(read_tcms_environments)
+        _requests.append(_environments)
+    try:
+        _plan = read_test_entity_with_id(ENTITY_TYPE_PLAN, _plan_id)
+        _product = read_product_for_test_entity(ENTITY_TYPE_PLAN, _plan)
+        _export_entity = TestPlanEntity(_plan[ATTR_ID], _plan[ATTR_NAME])
+        _export_entity.fill_product_data(_product)
+        _classification = find_tcms_object(TCMS_CLASS_ID_CLASSIFICATION, {ATTR_ID: _product[ATTR_CLASSIFICATION]})
+        _export_entity.add_master_data(ATTR_PRODUCT_CLASSIFICATIONS, _classification)
 
-    # fetch test plans and runs
-    task_monitor.log(I_EXP_FETCH_PLAN, _plan_name)
-    task_monitor.operations_processed(1)
-    _plans = read_tcms_plan(plan, _include_tree, _include_runs)
-    _export_entity.add_tcms_plans(_plans)
-    if _include_runs:
-        _export_entity.add_tcms_runs(read_tcms_run_tree(_plans, _build))
+        # fetch test plans and runs
+        task_monitor.log(I_EXP_FETCH_PLAN, _plan_name)
+        task_monitor.operations_processed(1)
+        _plans = read_tcms_plan(plan, _include_tree, _include_runs)
+        _export_entity.add_tcms_plans(_plans)
+        _runs = None
+        if _include_runs:
+            _runs = submit_tcms_request(read_tcms_run_tree, _plans, _build)
+            _requests.append(_runs)
 
-    # fetch test cases and executions
-    task_monitor.log(I_EXP_FETCH_PLAN_CASES, _plan_name)
-    task_monitor.operations_processed(5)
-    _cases = read_tcms_cases(False, _plans, _include_runs, _include_history)
-    _export_entity.add_tcms_cases(_cases)
-    if _include_runs:
-        _builds = None if _build is None else [_build]
-        _export_entity.add_tcms_executions(read_tcms_executions(_builds, _include_history, _cases))
+        # fetch test cases and executions
+        task_monitor.log(I_EXP_FETCH_PLAN_CASES, _plan_name)
+        task_monitor.operations_processed(5)
+        _cases = read_tcms_cases(False, _plans, _include_runs, _include_history)
+        if _runs is not None:
+            _export_entity.add_tcms_runs(_runs.result())
+        _export_entity.add_tcms_cases(_cases)
+        if _include_runs:
+            _builds = None if _build is None else [_build]
+            _export_entity.add_tcms_executions(read_tcms_executions(_builds, _include_history, _cases))
 
-    if options.get(OPTION_INCLUDE_ENVIRONMENTS):
-        _fetch_environments(_export_entity, task_monitor)
+        if _environments is not None:
+            _fetch_environments(_export_entity, _environments, task_monitor)
 
-    _fetch_referenced_master_data(_export_entity, task_monitor)
-    if _include_attachments:
-        download_attachments(_export_entity, output_path, task_monitor)
-    _write_output_file(_export_entity, os.path.join(output_path, f'testplan_{_plan_id}.toml'), task_monitor)
+        _fetch_referenced_master_data(_export_entity, task_monitor)
+        _write_output(_export_entity, output_path, f'testplan_{_plan_id}.toml', _include_attachments, task_monitor)
+    finally:
+        # no requests left in background after a failure
+        cancel_tcms_requests(_requests)
 
     return TaskResult(0, localized_message(I_GUI_EXPORT_PLAN_SUCCESSFUL, _plan_name))
 
@@ -189,38 +198,51 @@ def export_product(product_name, options, output_path, task_monitor):
     # fetch product specific metadata from TCMS
     task_monitor.log(I_EXP_FETCH_PRODUCT)
     task_monitor.operations_processed(1)
-    _product = find_tcms_object(TCMS_CLASS_ID_PRODUCT, {ATTR_NAME: product_name})
-    _export_entity = ProductEntity.from_tcms(_product)
-    _export_all_cases = options.get(OPTION_VERSION) is None
-    _fetch_product_master_data(_export_entity, _product, options.get(OPTION_VERSION), options.get(OPTION_BUILD))
-
-    # fetch test plans and runs from TCMS
-    task_monitor.log(I_EXP_FETCH_PLANS)
-    task_monitor.operations_processed(20)
-    _export_entity.add_tcms_plans(read_tcms_plans(_export_entity.master_data_of_type(ATTR_PRODUCT_VERSIONS),
-                                                  _include_runs))
-    if _include_runs:
-        _export_entity.add_tcms_runs(read_tcms_runs(_export_entity.master_data_of_type(ATTR_PRODUCT_BUILDS)))
-
-    # fetch test cases and executions from TCMS
-    task_monitor.log(I_EXP_FETCH_CASES)
-    task_monitor.operations_processed(40)
-    _filter_objects = _export_entity.master_data_of_type(ATTR_CASE_CATEGORIES) if _export_all_cases \
-        else _export_entity.test_plans()
-    _export_entity.add_tcms_cases(read_tcms_cases(_export_all_cases, _filter_objects,
-                                                  _include_runs, _include_history))
-    if _include_runs:
-        _executions = read_tcms_executions(_export_entity.master_data_of_type(ATTR_PRODUCT_BUILDS),
-                                           _include_history)
-        _export_entity.add_tcms_executions(_executions)
-
+    _requests = []
+    _environments = None
     if options.get(OPTION_INCLUDE_ENVIRONMENTS):
-        _fetch_environments(_export_entity, task_monitor)
+        _environments = submit_tcms_request(read_tcms_environments)
+        _requests.append(_environments)
+    try:
+        _product = find_tcms_object(TCMS_CLASS_ID_PRODUCT, {ATTR_NAME: product_name})
+        _export_entity = ProductEntity.from_tcms(_product)
+        _export_all_cases = options.get(OPTION_VERSION) is None
+        _fetch_product_master_data(_export_entity, _product, options.get(OPTION_VERSION), options.get(OPTION_BUILD))
 
-    _fetch_referenced_master_data(_export_entity, task_monitor)
-    if options.get(OPTION_INCLUDE_ATTACHMENTS):
-        download_attachments(_export_entity, output_path, task_monitor)
-    _write_output_file(_export_entity, os.path.join(output_path, f'{product_name}.toml'), task_monitor)
+        # fetch test plans and runs from TCMS
+        task_monitor.log(I_EXP_FETCH_PLANS)
+        task_monitor.operations_processed(20)
+        _runs = None
+        _executions = None
+        if _include_runs:
+            # runs and executions depend on builds only, read them while plans and cases are read
+            _builds = _export_entity.master_data_of_type(ATTR_PRODUCT_BUILDS)
+            _runs = submit_tcms_request(read_tcms_runs, _builds)
+            _executions = submit_tcms_request(read_tcms_executions, _builds, _include_history)
+            _requests.extend([_runs, _executions])
+        _export_entity.add_tcms_plans(read_tcms_plans(_export_entity.master_data_of_type(ATTR_PRODUCT_VERSIONS),
+                                                      _include_runs))
+
+        # fetch test cases and executions from TCMS
+        task_monitor.log(I_EXP_FETCH_CASES)
+        task_monitor.operations_processed(40)
+        _filter_objects = _export_entity.master_data_of_type(ATTR_CASE_CATEGORIES) if _export_all_cases \
+            else _export_entity.test_plans()
+        _cases = read_tcms_cases(_export_all_cases, _filter_objects, _include_runs, _include_history)
+        if _runs is not None:
+            _export_entity.add_tcms_runs(_runs.result())
+        _export_entity.add_tcms_cases(_cases)
+        if _executions is not None:
+            _export_entity.add_tcms_executions(_executions.result())
+
+        if _environments is not None:
+            _fetch_environments(_export_entity, _environments, task_monitor)
+
+        _fetch_referenced_master_data(_export_entity, task_monitor)
+        _write_output(_export_entity, output_path, f'{product_name}.toml', _include_attachments, task_monitor)
+    finally:
+        # no requests left in background after a failure
+        cancel_tcms_requests(_requests)
 
     return TaskResult(0, localized_message(I_GUI_EXPORT_PRODUCT_SUCCESSFUL, product_name))
 
@@ -235,16 +257,26 @@ def _fetch_product_master_data(entity, product, version, build):
     :param dict build: the TCMS build data; None for all product builds
     :raises IssaiException: if an error during TCMS communication occurs
     """
-    _categories = find_tcms_objects(TCMS_CLASS_ID_CATEGORY, {ATTR_PRODUCT: product[ATTR_ID]})
-    entity.add_master_data(ATTR_CASE_CATEGORIES, _categories)
-    _classification = find_tcms_object(TCMS_CLASS_ID_CLASSIFICATION, {ATTR_ID: product[ATTR_CLASSIFICATION]})
-    entity.add_master_data(ATTR_PRODUCT_CLASSIFICATIONS, _classification)
-    _components = find_tcms_objects(TCMS_CLASS_ID_COMPONENT, {ATTR_PRODUCT: product[ATTR_ID]})
-    entity.add_master_data(ATTR_CASE_COMPONENTS, _components)
-    _versions = read_tcms_versions_for_product(product) if version is None else [version]
-    entity.add_master_data(ATTR_PRODUCT_VERSIONS, _versions)
-    _builds = read_tcms_builds_for_version(_versions) if build is None else [build]
-    entity.add_master_data(ATTR_PRODUCT_BUILDS, _builds)
+    _product_id = product[ATTR_ID]
+    _product_filter = {ATTR_PRODUCT: _product_id}
+    _queries = [(ATTR_CASE_CATEGORIES, TCMS_CLASS_ID_CATEGORY, _product_filter),
+                (ATTR_PRODUCT_CLASSIFICATIONS, TCMS_CLASS_ID_CLASSIFICATION, {ATTR_ID: product[ATTR_CLASSIFICATION]}),
+                (ATTR_CASE_COMPONENTS, TCMS_CLASS_ID_COMPONENT, _product_filter)]
+    if version is None:
+        _queries.append((ATTR_PRODUCT_VERSIONS, TCMS_CLASS_ID_VERSION, _product_filter))
+        if build is None:
+            # all builds of the product, no need to wait for the versions
+            _builds_filter = {f'{ATTR_VERSION}__{ATTR_PRODUCT}': _product_id}
+            _queries.append((ATTR_PRODUCT_BUILDS, TCMS_CLASS_ID_BUILD, _builds_filter))
+    _results = find_tcms_objects_concurrently([(_class_id, _filter) for _, _class_id, _filter in _queries])
+    for (_data_type, _, _), _objects in zip(_queries, _results):
+        entity.add_master_data(_data_type, _objects)
+    if version is not None:
+        entity.add_master_data(ATTR_PRODUCT_VERSIONS, version)
+        _builds = read_tcms_builds_for_version([version]) if build is None else [build]
+        entity.add_master_data(ATTR_PRODUCT_BUILDS, _builds)
+    elif build is not None:
+        entity.add_master_data(ATTR_PRODUCT_BUILDS, build)
 
 
 def _fetch_referenced_master_data(entity, task_monitor):
@@ -256,39 +288,73 @@ def _fetch_referenced_master_data(entity, task_monitor):
     :raises IssaiException: if an error during TCMS communication occurs
     """
     task_monitor.log(I_EXP_FETCH_MASTER_DATA)
-    if not entity.holds_entity_with_type(ENTITY_TYPE_PRODUCT):
-        _versions = find_tcms_objects(TCMS_CLASS_ID_VERSION, {'id__in': entity.referenced_version_ids()})
-        entity.add_master_data(ATTR_PRODUCT_VERSIONS, _versions)
-        _builds = find_tcms_objects(TCMS_CLASS_ID_BUILD, {'id__in': entity.referenced_build_ids()})
-        entity.add_master_data(ATTR_PRODUCT_BUILDS, _builds)
-        _categories = find_tcms_objects(TCMS_CLASS_ID_CATEGORY, {'id__in': entity.referenced_category_ids()})
-        entity.add_master_data(ATTR_CASE_CATEGORIES, _categories)
-        _components = find_tcms_objects(TCMS_CLASS_ID_COMPONENT, {'id__in': entity.referenced_component_ids()})
-        entity.add_master_data(ATTR_CASE_COMPONENTS, _components)
+    _is_product = entity.holds_entity_with_type(ENTITY_TYPE_PRODUCT)
+    _queries = []
+    if not _is_product:
+        _queries.extend([(ATTR_PRODUCT_VERSIONS, TCMS_CLASS_ID_VERSION, entity.referenced_version_ids()),
+                         (ATTR_PRODUCT_BUILDS, TCMS_CLASS_ID_BUILD, entity.referenced_build_ids()),
+                         (ATTR_CASE_CATEGORIES, TCMS_CLASS_ID_CATEGORY, entity.referenced_category_ids()),
+                         (ATTR_CASE_COMPONENTS, TCMS_CLASS_ID_COMPONENT, entity.referenced_component_ids())])
+    # no request needed for objects that aren't referenced at all
+    _queries = [_query for _query in _queries if len(_query[2]) > 0]
+    # lookup values are read from TCMS only once, and then taken from the TCMS interface
+    _lookups = [(_data_type, submit_tcms_request(find_lookup_objects, _class_id, _ids))
+                for _data_type, _class_id, _ids in
+                ((ATTR_CASE_STATUSES, TCMS_CLASS_ID_TEST_CASE_STATUS, entity.referenced_case_status_ids()),
+                 (ATTR_EXECUTION_STATUSES, TCMS_CLASS_ID_TEST_EXECUTION_STATUS,
+                  entity.referenced_execution_status_ids()),
+                 (ATTR_PLAN_TYPES, TCMS_CLASS_ID_PLAN_TYPE, entity.referenced_plan_type_ids()),
+                 (ATTR_CASE_PRIORITIES, TCMS_CLASS_ID_PRIORITY, entity.referenced_priority_ids()))
+                if len(_ids) > 0]
+    try:
+        _results = find_tcms_objects_concurrently([(_class_id, {'id__in': _ids}) for _, _class_id, _ids in _queries])
+        for (_data_type, _, _), _objects in zip(_queries, _results):
+            entity.add_master_data(_data_type, _objects)
+        for _data_type, _lookup in _lookups:
+            entity.add_master_data(_data_type, _lookup.result())
+    finally:
+        # no lookups left in background after a failure
+        cancel_tcms_requests([_lookup for _, _lookup in _lookups])
+    if not _is_product:
         task_monitor.operations_processed(5)
-    _case_statuses = find_tcms_objects(TCMS_CLASS_ID_TEST_CASE_STATUS, {'id__in': entity.referenced_case_status_ids()})
-    entity.add_master_data(ATTR_CASE_STATUSES, _case_statuses)
-    _execution_statuses = find_tcms_objects(TCMS_CLASS_ID_TEST_EXECUTION_STATUS,
-                                            {'id__in': entity.referenced_execution_status_ids()})
-    entity.add_master_data(ATTR_EXECUTION_STATUSES, _execution_statuses)
-    _plan_types = find_tcms_objects(TCMS_CLASS_ID_PLAN_TYPE, {'id__in': entity.referenced_plan_type_ids()})
-    entity.add_master_data(ATTR_PLAN_TYPES, _plan_types)
-    _priorities = find_tcms_objects(TCMS_CLASS_ID_PRIORITY, {'id__in': entity.referenced_priority_ids()})
-    entity.add_master_data(ATTR_CASE_PRIORITIES, _priorities)
-    _users = find_tcms_objects(TCMS_CLASS_ID_USER, {'id__in': entity.referenced_user_ids()})
-    entity.add_master_data(ATTR_TCMS_USERS, _users)
+    # users referenced by components are known only after the components have been added
+    _user_ids = entity.referenced_user_ids()
+    if len(_user_ids) > 0:
+        entity.add_master_data(ATTR_TCMS_USERS, find_tcms_objects(TCMS_CLASS_ID_USER, {'id__in': _user_ids}))
     task_monitor.operations_processed(5)
 
 
-def _fetch_environments(entity, task_monitor):
+def _fetch_environments(entity, environments_request, task_monitor):
     """
-    Fetches all environments and stores the data in the given entity.
+    Waits for all environments to be read from TCMS and stores the data in the given entity.
     :param Entity entity: the entity
+    :param concurrent.futures.Future environments_request: the pending request reading the environments
     :param issai.core.task.TaskMonitor task_monitor: the progress handler
     :raises IssaiException: if an error during TCMS communication occurs
     """
     task_monitor.log(I_EXP_FETCH_ENVIRONMENTS)
-    entity.add_environments(read_tcms_environments())
+    entity.add_environments(environments_request.result())
+
+
+def _write_output(entity, output_path, file_name, include_attachments, task_monitor):
+    """
+    Writes data of specified entity to output file and eventually downloads all attachments.
+    The output file is written while the attachments are downloaded. Downloads not started yet are cancelled, if
+    writing the output file fails.
+    :param Entity entity: the entity
+    :param str output_path: the output directory path
+    :param str file_name: the output file name without path
+    :param bool include_attachments: indicates whether to download attachments
+    :param TaskMonitor task_monitor: the progress handler
+    :raises IssaiException: if write or download operation fails
+    """
+    _downloads = start_attachment_downloads(entity, output_path, task_monitor) if include_attachments else []
+    try:
+        _write_output_file(entity, os.path.join(output_path, file_name), task_monitor)
+        wait_for_attachment_downloads(_downloads, task_monitor)
+    finally:
+        # no downloads in background after a failure
+        cancel_tcms_requests(_downloads)
 
 
 def _write_output_file(entity, output_file_path, task_monitor):
@@ -36,6 +36,8 @@
 Functions to import entities from files to TCMS.
 """
 
+from collections import deque
+
 from issai.core.attachments import (attachment_file_path, upload_attachment_file, upload_attachment, url_file_name,
                                     url_object_id)
 from issai.core.entities import *
@@ -82,27 +84,57 @@ def import_file(entity, options, file_path, task_monitor):
         _msg = localized_message(E_INVALID_ENTITY_TYPE, entity.entity_type_id())
         raise IssaiException(E_INTERNAL_ERROR, _msg)
     if _include_attachments:
-        _dry_run = options.get(OPTION_DRY_RUN)
-        _input_path = os.path.dirname(file_path)
-        _attachments = entity.attachments()
+        _upload_attachments(entity, options, file_path, task_monitor)
+    if task_monitor.errors_detected():
+        _result = TaskResult(1, _failure_message)
+    return _result
+
+
+def _upload_attachments(entity, options, file_path, task_monitor):
+    """
+    Uploads all attachment files of an entity to TCMS. The files must be placed in subdirectory attachments of the
+    import file's directory.
+    Uploads are independent of each other and run in parallel. Uploads not started yet are cancelled, if an upload
+    fails or the user requests task abortion.
+    :param Entity entity: the imported entity
+    :param dict options: the import control options
+    :param str file_path: the name of the imported file including full path
+    :param TaskMonitor task_monitor: the progress handler
+    :raises IssaiException: if upload fails
+    """
+    _dry_run = options.get(OPTION_DRY_RUN)
+    _input_path = os.path.dirname(file_path)
+    _attachments = entity.attachments()
+    _is_result = isinstance(entity, PlanResultEntity)
+    # progress is logged in order of submission
+    _uploads = []
+    try:
         for _class_id, _object_infos in _attachments.items():
             _class_name = tcms_class_name_for_id(_class_id)
             task_monitor.operations_processed(1)
             for _object_id, _urls in _object_infos.items():
                 for _url in _urls:
-                    if isinstance(entity, PlanResultEntity):
-                        # separate handling for results
-                        _file_path = attachment_file_path(_input_path, _url, TCMS_CLASS_ID_TEST_EXECUTION, _object_id)
-                        _tcms_file_name = f'testexecution_{_object_id}_{_url}'
-                        _case_result = entity.case_result_for_execution(_object_id)
-                        _run_id = _case_result[ATTR_RUN]
+                    if _is_result:
+                        # separate handling for results, all output files are attached to the test run
+                        if _class_id == TCMS_CLASS_ID_TEST_CASE:
+                            # case result output files are keyed by execution ID
+                            _file_path = attachment_file_path(_input_path, _url, TCMS_CLASS_ID_TEST_EXECUTION,
+                                                              _object_id)
+                            _tcms_file_name = f'testexecution_{_object_id}_{_url}'
+                            _run_id = entity.run_for_execution(_object_id)
+                        else:
+                            _file_path = attachment_file_path(_input_path, _url, TCMS_CLASS_ID_TEST_RUN, _object_id)
+                            _tcms_file_name = _url
+                            _run_id = _object_id
                         if _dry_run:
                             if os.path.isfile(_file_path):
                                 task_monitor.log(I_DRY_RUN_UPLOAD_ATTACHMENT, _class_name, _file_path)
                             else:
                                 task_monitor.log(E_ATTACHMENT_MISSING, _file_path)
                             continue
-                        upload_attachment_file(_file_path, _tcms_file_name, TCMS_CLASS_ID_TEST_RUN, _run_id)
+                        _upload = submit_tcms_request(upload_attachment_file, _file_path, _tcms_file_name,
+                                                      TCMS_CLASS_ID_TEST_RUN, _run_id)
+                        _uploads.append((_upload, (_tcms_file_name, TCMS_CLASS_TEST_RUN, _run_id)))
                         continue
                     _file_name = url_file_name(_url)
                     _url_id = url_object_id(_url)
@@ -113,11 +145,16 @@ def import_file(entity, options, file_path, task_monitor):
                         else:
                             task_monitor.log(E_ATTACHMENT_MISSING, _file_path)
                         continue
-                    upload_attachment(_input_path, _file_name, _url_id, _class_id, _object_id)
-                    task_monitor.log(I_GUI_PROGRESS_UPLOAD_FILE, _file_name, _class_name, _object_id)
-    if task_monitor.errors_detected():
-        _result = TaskResult(1, _failure_message)
-    return _result
+                    _upload = submit_tcms_request(upload_attachment, _input_path, _file_name, _url_id, _class_id,
+                                                  _object_id)
+                    _uploads.append((_upload, (_file_name, _class_name, _object_id)))
+        for _upload, _log_args in _uploads:
+            _upload.result()
+            if _log_args is not None:
+                task_monitor.log(I_GUI_PROGRESS_UPLOAD_FILE, *_log_args)
+    finally:
+        # no uploads in background after a failure or abort
+        cancel_tcms_requests([_upload for _upload, _ in _uploads])
 
 
 def _import_plan_result_entity(plan_result, options, task_monitor):
@@ -130,13 +167,41 @@ def _import_plan_result_entity(plan_result, options, task_monitor):
     """
     _case_results = plan_result[ATTR_TEST_CASE_RESULTS].values()
     _plan_results = plan_result[ATTR_TEST_PLAN_RESULTS].values()
+    # read all TCMS objects referenced by the results in advance, with one request per TCMS class
+    _executions, _testers, _runs = _find_tcms_objects_with_keys(
+        [(TCMS_CLASS_ID_TEST_EXECUTION, f'{ATTR_ID}__in', [_cr[ATTR_EXECUTION] for _cr in _case_results]),
+         (TCMS_CLASS_ID_USER, f'{ATTR_USERNAME}__in', list({_cr[ATTR_TESTER_NAME] for _cr in _case_results})),
+         (TCMS_CLASS_ID_TEST_RUN, f'{ATTR_ID}__in', [_pr[ATTR_RUN] for _pr in _plan_results])])
+    _cases, _plans = _find_tcms_objects_with_keys(
+        [(TCMS_CLASS_ID_TEST_CASE, f'{ATTR_ID}__in', list({_e[ATTR_CASE] for _e in _executions})),
+         (TCMS_CLASS_ID_TEST_PLAN, f'{ATTR_ID}__in', list({_r[ATTR_PLAN] for _r in _runs}))])
+    _tcms_objects = {TCMS_CLASS_ID_TEST_CASE: {_c[ATTR_ID]: _c for _c in _cases},
+                     TCMS_CLASS_ID_TEST_EXECUTION: {_e[ATTR_ID]: _e for _e in _executions},
+                     TCMS_CLASS_ID_TEST_PLAN: {_p[ATTR_ID]: _p for _p in _plans},
+                     TCMS_CLASS_ID_TEST_RUN: {_r[ATTR_ID]: _r for _r in _runs},
+                     TCMS_CLASS_ID_USER: {_u[ATTR_USERNAME]: _u for _u in _testers}}
+    _current_user = TcmsInterface.current_user()
     for _cr in _case_results:
-        _import_case_result(_cr, options, task_monitor)
+        _import_case_result(_cr, options, _tcms_objects, _current_user, task_monitor)
     for _pr in _plan_results:
-        _import_plan_result(_pr, task_monitor)
+        _import_plan_result(_pr, _tcms_objects, task_monitor)
     return TaskResult(0, localized_message(I_GUI_IMPORT_PLAN_RESULT_SUCCESSFUL, plan_result.entity_id()))
 
 
+def _find_tcms_objects_with_keys(queries):
+    """
+    Reads TCMS objects for several independent queries with a list of key values each from TCMS.
+    Queries with an empty list of key values are not issued at all.
+    :param list[tuple] queries: the queries, each consisting of TCMS class ID, filter attribute name and key values
+    :returns: TCMS objects found, one list per query in query order; empty list for queries without key values
+    :rtype: list[list]
+    :raises IssaiException: if an error occurs during communication with TCMS
+    """
+    _results = iter(find_tcms_objects_concurrently([(_class_id, {_attr: _keys})
+                                                    for _class_id, _attr, _keys in queries if len(_keys) > 0]))
+    return [next(_results) if len(_keys) > 0 else [] for _, _, _keys in queries]
+
+
 def _import_case_container(container, options, task_monitor):
     """
     Imports a test case from file.
@@ -160,6 +225,7 @@ def _import_environments(container, options, task_monitor):
     """
     if not options.get(OPTION_INCLUDE_ENVIRONMENTS):
         return
+    _dry_run = task_monitor.is_dry_run()
     _container_envs = container[ATTR_ENVIRONMENTS]
     _envs_status = tcms_objects_status(TCMS_CLASS_ID_ENVIRONMENT, _container_envs, [ATTR_NAME])
     for _env_id, _env_status in _envs_status.items():
@@ -173,7 +239,7 @@ def _import_environments(container, options, task_monitor):
             task_monitor.log(I_IMP_OBJECT_SKIPPED, TCMS_CLASS_ENVIRONMENT, _env_name, _tcms_env[ATTR_ID])
         else:
             # environment doesn't exist in TCMS
-            if not task_monitor.is_dry_run():
+            if not _dry_run:
                 _tcms_env = create_tcms_object(TCMS_CLASS_ID_ENVIRONMENT, _env)
                 container.replace_attribute(TCMS_CLASS_ID_ENVIRONMENT, _env_id, _tcms_env)
             task_monitor.log(I_IMP_OBJECT_CREATED, TCMS_CLASS_ENVIRONMENT, _env_name)
@@ -187,6 +253,7 @@ def _import_cases(container, product_existed, task_monitor):
     :param TaskMonitor task_monitor: the progress handler
     :raises IssaiException: if import fails
     """
+    _dry_run = task_monitor.is_dry_run()
     _container_cases = container[ATTR_TEST_CASES]
     if product_existed:
         _cases_status = tcms_objects_status(TCMS_CLASS_ID_TEST_CASE, _container_cases, [ATTR_SUMMARY, ATTR_CATEGORY])
@@ -206,7 +273,7 @@ def _import_cases(container, product_existed, task_monitor):
             task_monitor.log(I_IMP_OBJECT_SKIPPED, TCMS_CLASS_TEST_CASE, _case_name, _tcms_case[ATTR_ID])
         else:
             # test case doesn't exist in TCMS
-            if not task_monitor.is_dry_run():
+            if not _dry_run:
                 _case[ATTR_PRODUCT] = container[ATTR_PRODUCT][ATTR_ID]
                 _tcms_case = create_tcms_object(TCMS_CLASS_ID_TEST_CASE, _case)
                 container.replace_attribute(TCMS_CLASS_ID_TEST_CASE, _case_id, _tcms_case)
@@ -221,6 +288,7 @@ def _import_executions(container, product_existed, task_monitor):
     :param TaskMonitor task_monitor: the progress handler
     :raises IssaiException: if import fails
     """
+    _dry_run = task_monitor.is_dry_run()
     _container_cases = container[ATTR_TEST_CASES]
     _container_executions = container[ATTR_TEST_EXECUTIONS]
     if product_existed:
@@ -244,7 +312,7 @@ def _import_executions(container, product_existed, task_monitor):
                              _tcms_execution[ATTR_ID])
         else:
             # test execution doesn't exist in TCMS
-            if not task_monitor.is_dry_run():
+            if not _dry_run:
                 _tcms_execution = create_tcms_object(TCMS_CLASS_ID_TEST_EXECUTION, _execution)
                 container.replace_attribute(TCMS_CLASS_ID_TEST_EXECUTION, _execution_id, _tcms_execution)
             task_monitor.log(I_IMP_EXECUTION_CREATED, _execution_name, _execution[ATTR_RUN])
@@ -258,7 +326,7 @@ def _import_plans(container, product_existed, task_monitor):
     :param TaskMonitor task_monitor: the progress handler
     :raises IssaiException: if import fails
     """
-    _parent_ids = set()
+    _dry_run = task_monitor.is_dry_run()
     _container_plans = container[ATTR_TEST_PLANS]
     if product_existed:
         _plans_status = tcms_objects_status(TCMS_CLASS_ID_TEST_PLAN, _container_plans,
@@ -267,38 +335,36 @@ def _import_plans(container, product_existed, task_monitor):
         _plans_status = {}
         for _plan_id, _plan in _container_plans.items():
             _plans_status[_plan_id] = ObjectStatus(ObjectStatus.NO_MATCH, TCMS_CLASS_ID_TEST_PLAN, _plan)
-    _plan_ids_processed = set()
-    _last_status_count = -1
-    while len(_plans_status) != _last_status_count:
-        _last_status_count = len(_plans_status)
-        for _id in _plan_ids_processed:
-            del _plans_status[_id]
-        _plan_ids_processed.clear()
-        for _plan_id, _plan_status in _plans_status.items():
-            task_monitor.operations_processed(1)
-            _plan = _plan_status.container_object()
-            _parent_plan = _plan.get(ATTR_PARENT)
-            if _parent_plan is not None and _parent_plan not in _parent_ids and not task_monitor.is_dry_run():
-                # skip child plan
-                continue
-            _plan_ids_processed.add(_plan_id)
-            _plan_name = _plan[ATTR_NAME]
-            if _plan_status.is_exact_match():
-                _parent_ids.add(_plan_id)
-                task_monitor.log(I_IMP_OBJECT_SKIPPED, TCMS_CLASS_TEST_PLAN, _plan_name, _plan_id)
-                continue
-            if _plan_status.is_name_match():
-                _tcms_plan = _plan_status.tcms_object()
-                container.replace_attribute(TCMS_CLASS_ID_TEST_PLAN, _plan_id, _tcms_plan)
-                _parent_ids.add(_tcms_plan[ATTR_ID])
-                task_monitor.log(I_IMP_OBJECT_SKIPPED, TCMS_CLASS_TEST_PLAN, _plan_name, _tcms_plan[ATTR_ID])
-                continue
-            # test plan doesn't exist in TCMS
-            if not task_monitor.is_dry_run():
-                _tcms_plan = create_tcms_object(TCMS_CLASS_ID_TEST_PLAN, _plan)
-                container.replace_attribute(TCMS_CLASS_ID_TEST_PLAN, _plan_id, _tcms_plan)
-                _parent_ids.add(_tcms_plan[ATTR_ID])
-            task_monitor.log(I_IMP_OBJECT_CREATED, TCMS_CLASS_TEST_PLAN, _plan_name)
+    # parent plans must be imported before their children, because children reference the parent's TCMS ID;
+    # plans with a parent not contained in the container are skipped
+    _child_ids = {}
+    _pending_ids = deque()
+    for _plan_id, _plan_status in _plans_status.items():
+        _parent_id = _plan_status.container_object().get(ATTR_PARENT)
+        if _parent_id is None or _dry_run:
+            _pending_ids.append(_plan_id)
+        else:
+            _child_ids.setdefault(_parent_id, []).append(_plan_id)
+    while len(_pending_ids) > 0:
+        _plan_id = _pending_ids.popleft()
+        _plan_status = _plans_status[_plan_id]
+        _pending_ids.extend(_child_ids.get(_plan_id, ()))
+        task_monitor.operations_processed(1)
+        _plan = _plan_status.container_object()
+        _plan_name = _plan[ATTR_NAME]
+        if _plan_status.is_exact_match():
+            task_monitor.log(I_IMP_OBJECT_SKIPPED, TCMS_CLASS_TEST_PLAN, _plan_name, _plan_id)
+            continue
+        if _plan_status.is_name_match():
+            _tcms_plan = _plan_status.tcms_object()
+            container.replace_attribute(TCMS_CLASS_ID_TEST_PLAN, _plan_id, _tcms_plan)
+            task_monitor.log(I_IMP_OBJECT_SKIPPED, TCMS_CLASS_TEST_PLAN, _plan_name, _tcms_plan[ATTR_ID])
+            continue
+        # test plan doesn't exist in TCMS
+        if not _dry_run:
+            _tcms_plan = create_tcms_object(TCMS_CLASS_ID_TEST_PLAN, _plan)
+            container.replace_attribute(TCMS_CLASS_ID_TEST_PLAN, _plan_id, _tcms_plan)
+        task_monitor.log(I_IMP_OBJECT_CREATED, TCMS_CLASS_TEST_PLAN, _plan_name)
 
 
 def _import_runs(container, product_existed, task_monitor):
@@ -309,6 +375,7 @@ def _import_runs(container, product_existed, task_monitor):
     :param TaskMonitor task_monitor: the progress handler
     :raises IssaiException: if import fails
     """
+    _dry_run = task_monitor.is_dry_run()
     _container_plans = container[ATTR_TEST_PLANS]
     _container_runs = container[ATTR_TEST_RUNS]
     if product_existed:
@@ -330,18 +397,21 @@ def _import_runs(container, product_existed, task_monitor):
             task_monitor.log(I_IMP_RUN_SKIPPED, _run_name, _run[ATTR_BUILD], _tcms_run[ATTR_ID])
             continue
         # test run doesn't exist in TCMS
-        if not task_monitor.is_dry_run():
+        if not _dry_run:
             _tcms_run = create_tcms_object(TCMS_CLASS_ID_TEST_RUN, _run)
             container.replace_attribute(TCMS_CLASS_ID_TEST_RUN, _run_id, _tcms_run)
         task_monitor.log(I_IMP_RUN_CREATED, _run_name, _run[ATTR_BUILD])
 
 
-def _import_case_result(case_result, options, task_monitor):
+def _import_case_result(case_result, options, tcms_objects, current_user, task_monitor):
     """
     Imports a single test case result from file.
     Import of test case execution output files is currently not supported.
     :param dict case_result: the test case result to import
     :param dict options: the import control options, only 'dry-run' supported here
+    :param dict tcms_objects: the TCMS objects referenced by the plan result, key TCMS class ID, value dict with
+                              key object ID or user name and value TCMS object
+    :param dict current_user: the TCMS user running the import
     :param task_monitor: the progress handler
     :returns: TCMS ID of updated test execution
     :rtype: int
@@ -352,11 +422,11 @@ def _import_case_result(case_result, options, task_monitor):
     _execution_id = case_result[ATTR_EXECUTION]
     task_monitor.operations_processed(1)
     try:
-        _execution = find_tcms_object(TCMS_CLASS_ID_TEST_EXECUTION, {ATTR_ID: _execution_id})
+        _execution = tcms_objects[TCMS_CLASS_ID_TEST_EXECUTION].get(_execution_id)
         if _execution is None:
             raise IssaiException(E_TCMS_SUBORDINATE_OBJECT_NOT_FOUND, TCMS_CLASS_TEST_EXECUTION, _execution_id,
                                  TCMS_CLASS_TEST_CASE, _case_name)
-        _case = find_tcms_object(TCMS_CLASS_ID_TEST_CASE, {ATTR_ID: _execution[ATTR_CASE]})
+        _case = tcms_objects[TCMS_CLASS_ID_TEST_CASE].get(_execution[ATTR_CASE])
         _tcms_case_name = _case[ATTR_SUMMARY]
         if _tcms_case_name != _case_name:
             raise IssaiException(E_IMP_OWNING_OBJECT_MISMATCH, TCMS_CLASS_TEST_CASE, _case_name,
@@ -365,19 +435,18 @@ def _import_case_result(case_result, options, task_monitor):
         if _status_id is None:
             raise IssaiException(E_IMP_TCMS_OBJECT_MISSING, TCMS_CLASS_TEST_EXECUTION_STATUS, case_result[ATTR_STATUS])
         _tester_name = case_result[ATTR_TESTER_NAME]
-        _tester = find_tcms_object(TCMS_CLASS_ID_USER, {ATTR_USERNAME: _tester_name})
-        _current_user = TcmsInterface.current_user()
+        _tester = tcms_objects[TCMS_CLASS_ID_USER].get(_tester_name)
         _ref_handling = options.get(OPTION_USER_REFERENCES)
         if _tester is None:
-            _tester = _current_user
+            _tester = current_user
             if _ref_handling == OPTION_VALUE_USER_REF_REPLACE_NEVER:
                 raise IssaiException(E_IMP_USER_NOT_FOUND, _tester_name, _tester[ATTR_USERNAME])
             if _dry_run:
                 task_monitor.log(I_IMP_USER_REPL_CURRENT, _tester[ATTR_USERNAME], _tester_name)
-        elif _current_user[ATTR_ID] != _tester[ATTR_ID]:
+        elif current_user[ATTR_ID] != _tester[ATTR_ID]:
             if _ref_handling == OPTION_VALUE_USER_REF_REPLACE_ALWAYS:
-                _tester = _current_user
-                task_monitor.log(I_IMP_USER_REPL_CURRENT, _current_user[ATTR_USERNAME], _tester_name)
+                _tester = current_user
+                task_monitor.log(I_IMP_USER_REPL_CURRENT, current_user[ATTR_USERNAME], _tester_name)
     except IssaiException as _e:
         raise
     except Exception as _e:
@@ -407,10 +476,12 @@ def _import_plan_container(container, options, task_monitor):
     _import_executions(container, True, task_monitor)
 
 
-def _import_plan_result(plan_result, task_monitor):
+def _import_plan_result(plan_result, tcms_objects, task_monitor):
     """
     Imports a single test plan result from file.
     :param PlanResultEntity plan_result: the entity to import
+    :param dict tcms_objects: the TCMS objects referenced by the plan result, key TCMS class ID, value dict with
+                              key object ID and value TCMS object
     :param TaskMonitor task_monitor: the progress handler
     :returns: TCMS ID of updated test run
     :rtype: int
@@ -420,11 +491,11 @@ def _import_plan_result(plan_result, task_monitor):
     _run_id = plan_result[ATTR_RUN]
     task_monitor.operations_processed(1)
     try:
-        _run = find_tcms_object(TCMS_CLASS_ID_TEST_RUN, {ATTR_ID: _run_id})
+        _run = tcms_objects[TCMS_CLASS_ID_TEST_RUN].get(_run_id)
         if _run is None:
             raise IssaiException(E_TCMS_SUBORDINATE_OBJECT_NOT_FOUND, TCMS_CLASS_TEST_RUN, _run_id,
                                  TCMS_CLASS_TEST_PLAN, _plan_name)
-        _plan = find_tcms_object(TCMS_CLASS_ID_TEST_PLAN, {ATTR_ID: _run[ATTR_PLAN]})
+        _plan = tcms_objects[TCMS_CLASS_ID_TEST_PLAN].get(_run[ATTR_PLAN])
         _tcms_plan_name = _plan[ATTR_NAME]
         if _tcms_plan_name != _plan_name:
             raise IssaiException(E_IMP_OWNING_OBJECT_MISMATCH, TCMS_CLASS_TEST_PLAN, _plan_name,
@@ -475,7 +546,10 @@ def _prepare_master_data(container, options, task_monitor):
     _auto_create = options.get(OPTION_AUTO_CREATE)
     _product = container[ATTR_PRODUCT]
     _master_data_status = tcms_master_data_status(_product, container[ATTR_MASTER_DATA])
-    for _class_id, _class_status in sorted(_master_data_status.items()):
+    for _class_id in _MASTER_DATA_IMPORT_ORDER:
+        _class_status = _master_data_status.get(_class_id)
+        if _class_status is None:
+            continue
         if _class_id == TCMS_CLASS_ID_USER:
             # users need special treatment and are handled in separate function
             _prepare_user(container, options, _class_status, task_monitor)
@@ -633,3 +707,7 @@ def _prepare_product(container, options, task_monitor):
     task_monitor.log(I_IMP_OBJECT_CREATED, TCMS_CLASS_PRODUCT, _product_name)
     task_monitor.operations_processed(1)
     return False
+
+
+# master data classes in processing order, derived from the class IDs, which put versions before builds
+_MASTER_DATA_IMPORT_ORDER = tuple(sorted(set(MASTER_DATA_TYPE_TCMS_CLASS_IDS.values())))
@@ -43,6 +43,7 @@ import re
 import threading
 import traceback
 import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
 
 from tcms_api import TCMS
 
@@ -135,6 +136,7 @@ class TcmsInterface:
     _execution_statuses_by_id = dict()
     _execution_statuses_by_name = dict()
     _connections = dict()
+    _lookup_objects = dict()
 
     @staticmethod
     def confirmed_case_status_id():
@@ -223,6 +225,66 @@ class TcmsInterface:
         finally:
             TcmsInterface._lock.release()
 
+    @staticmethod
+    def lookup_objects(class_id, reload=False):
+        """
+        Returns all objects of a TCMS class holding lookup values, like priorities or plan types.
+        Case and execution statuses are taken from the data read on connect, plan types and priorities are read from
+        TCMS on first request. Objects created later on are registered by function object_created.
+        :param int class_id: the TCMS class ID
+        :param bool reload: indicates whether to read the objects from TCMS again, ignoring data already known
+        :returns: all objects of the class
+        :rtype: list
+        :raises IssaiException: if an error occurs during communication with TCMS
+        """
+        try:
+            if TcmsInterface._lock.acquire():
+                if not TcmsInterface._initialized:
+                    TcmsInterface._connect_to_server()
+                if reload:
+                    TcmsInterface._lookup_objects.pop(class_id, None)
+                elif class_id == TCMS_CLASS_ID_TEST_CASE_STATUS:
+                    return list(TcmsInterface._case_statuses_by_id.values())
+                elif class_id == TCMS_CLASS_ID_TEST_EXECUTION_STATUS:
+                    return list(TcmsInterface._execution_statuses_by_id.values())
+                _objects = TcmsInterface._lookup_objects.get(class_id)
+        except BaseException as _e:
+            raise IssaiException(E_TCMS_INIT_FAILED, str(_e))
+        finally:
+            TcmsInterface._lock.release()
+        if _objects is None:
+            # read without holding the lock, other threads need it to obtain their connection
+            _objects = find_tcms_objects(class_id, {})
+            if class_id in (TCMS_CLASS_ID_TEST_CASE_STATUS, TCMS_CLASS_ID_TEST_EXECUTION_STATUS):
+                for _object in _objects:
+                    TcmsInterface.object_created(class_id, _object)
+                return _objects
+            try:
+                if TcmsInterface._lock.acquire():
+                    TcmsInterface._lookup_objects[class_id] = _objects
+            finally:
+                TcmsInterface._lock.release()
+        return _objects
+
+    @staticmethod
+    def object_created(class_id, tcms_object):
+        """
+        Registers a TCMS object created by Issai, so that subsequent lookups include the new object.
+        :param int class_id: the TCMS class ID
+        :param dict tcms_object: the created TCMS object
+        """
+        if TcmsInterface._lock.acquire():
+            if class_id == TCMS_CLASS_ID_TEST_CASE_STATUS:
+                TcmsInterface._case_statuses_by_id[tcms_object[ATTR_ID]] = tcms_object
+                TcmsInterface._case_statuses_by_name[tcms_object[ATTR_NAME]] = tcms_object
+            elif class_id == TCMS_CLASS_ID_TEST_EXECUTION_STATUS:
+                TcmsInterface._execution_statuses_by_id[tcms_object[ATTR_ID]] = tcms_object
+                TcmsInterface._execution_statuses_by_name[tcms_object[ATTR_NAME]] = tcms_object
+            else:
+                # read again on next request
+                TcmsInterface._lookup_objects.pop(class_id, None)
+        TcmsInterface._lock.release()
+
     @staticmethod
     def reset():
         """
@@ -242,6 +304,7 @@ class TcmsInterface:
             TcmsInterface._case_statuses_by_name.clear()
             TcmsInterface._execution_statuses_by_id.clear()
             TcmsInterface._execution_statuses_by_name.clear()
+            TcmsInterface._lookup_objects.clear()
         TcmsInterface._lock.release()
 
     @staticmethod
@@ -261,13 +324,15 @@ class TcmsInterface:
         _user = _xml_rpc_cxn.User.filter({ATTR_USERNAME: _user_name})[0]
         TcmsInterface._current_user = _remove_unsupported_attrs(_user, _SUPPORTED_ATTRS[TCMS_CLASS_USER])
         TcmsInterface._server_version = _xml_rpc_cxn.KiwiTCMS.version()
-        _case_statuses = _xml_rpc_cxn.TestCaseStatus.filter({})
+        _case_statuses = _remove_unsupported_attrs(_xml_rpc_cxn.TestCaseStatus.filter({}),
+                                                   _SUPPORTED_ATTRS[TCMS_CLASS_TEST_CASE_STATUS])
         for _case_status in _case_statuses:
             TcmsInterface._case_statuses_by_id[_case_status[ATTR_ID]] = _case_status
             TcmsInterface._case_statuses_by_name[_case_status[ATTR_NAME]] = _case_status
             if _case_status[ATTR_IS_CONFIRMED]:
                 TcmsInterface._case_status_id_confirmed = _case_status[ATTR_ID]
-        _execution_statuses = _xml_rpc_cxn.TestExecutionStatus.filter({})
+        _execution_statuses = _remove_unsupported_attrs(_xml_rpc_cxn.TestExecutionStatus.filter({}),
+                                                        _SUPPORTED_ATTRS[TCMS_CLASS_TEST_EXECUTION_STATUS])
         for _execution_status in _execution_statuses:
             TcmsInterface._execution_statuses_by_id[_execution_status[ATTR_ID]] = _execution_status
             TcmsInterface._execution_statuses_by_name[_execution_status[ATTR_NAME]] = _execution_status
@@ -427,6 +492,8 @@ def create_tcms_object(class_id, container_object):
             _msg = localized_message(E_TCMS_INVALID_CLASS_ID, class_id)
             raise IssaiException(E_INTERNAL_ERROR, _msg)
         _object = _remove_unsupported_attrs(_object, _SUPPORTED_ATTRS[tcms_class_name_for_id(class_id)])
+        if class_id in _LOOKUP_CLASS_IDS:
+            TcmsInterface.object_created(class_id, _object.copy())
         if ATTR_ATTACHMENTS in container_object:
             _object[ATTR_ATTACHMENTS] = container_object[ATTR_ATTACHMENTS]
         return _object
@@ -456,6 +523,64 @@ def find_tcms_objects(class_id, filter_attributes):
         raise IssaiException(E_TCMS_FIND_OBJECT_FAILED, tcms_class_name_for_id(class_id), str(_e))
 
 
+def find_tcms_objects_concurrently(queries):
+    """
+    Reads TCMS objects for several independent queries from TCMS.
+    The queries are issued in parallel, every worker thread uses its own XML-RPC connection.
+    :param list[tuple] queries: the queries, each consisting of TCMS class ID and filter attributes
+    :returns: TCMS objects found, one list per query in query order
+    :rtype: list[list]
+    :raises IssaiException: if an error occurs during communication with TCMS
+    """
+    _requests = [submit_tcms_request(find_tcms_objects, _class_id, _filter) for _class_id, _filter in queries]
+    try:
+        return [_request.result() for _request in _requests]
+    finally:
+        # remaining queries are useless after a failure
+        cancel_tcms_requests(_requests)
+
+
+def find_lookup_objects(class_id, object_ids):
+    """
+    Returns objects with specified IDs of a TCMS class holding lookup values, like priorities or plan types.
+    The objects are read from TCMS only once, see TcmsInterface.lookup_objects; copies are returned.
+    If some of the desired objects are unknown, the objects are read from TCMS again, they may have been created by
+    another user in the meantime.
+    :param int class_id: the TCMS class ID of case statuses, execution statuses, plan types or priorities
+    :param list[int] object_ids: the IDs of the desired objects
+    :returns: TCMS objects found
+    :rtype: list
+    :raises IssaiException: if an error occurs during communication with TCMS
+    """
+    _object_ids = set(object_ids)
+    _objects = [_object for _object in TcmsInterface.lookup_objects(class_id) if _object[ATTR_ID] in _object_ids]
+    if len(_objects) < len(_object_ids):
+        _objects = [_object for _object in TcmsInterface.lookup_objects(class_id, True)
+                    if _object[ATTR_ID] in _object_ids]
+    return [_object.copy() for _object in _objects]
+
+
+def submit_tcms_request(function, *args):
+    """
+    Runs a function communicating with TCMS in a worker thread.
+    The function must not depend on data changed by the calling thread while the request is pending.
+    :param Callable function: the function to run, e.g. one of the read_tcms_... functions
+    :param Any args: the function arguments
+    :returns: the pending request, result() returns the function result or raises its exception
+    :rtype: concurrent.futures.Future
+    """
+    return _REQUEST_EXECUTOR.submit(function, *args)
+
+
+def cancel_tcms_requests(requests):
+    """
+    Cancels requests submitted by submit_tcms_request. Requests already running are not affected.
+    :param list[concurrent.futures.Future] requests: the requests to cancel
+    """
+    for _request in requests:
+        _request.cancel()
+
+
 def find_tcms_object(class_id, filter_attributes):
     """
     Reads TCMS object matching specified attributes from TCMS.
@@ -909,9 +1034,8 @@ def tcms_master_data_status(product, master_data):
         for _data_type, _objects in master_data.items():
             if len(_objects) == 0 or _data_type == ATTR_PRODUCT_BUILDS:
                 continue
-            _class_id = tcms_class_id_for_master_data_type(_data_type)
+            _class_id, _name_attr = MASTER_DATA_TYPE_CLASS_INFOS[_data_type]
             _class_status = {}
-            _name_attr = name_attribute_for_tcms_class(_class_id)
             _names = [_obj[_name_attr] for _obj in _objects.values()]
             _tcms_objects = _read_objects_by_name(_cxn, product, _class_id, _name_attr, _names)
             for _object_id, _object in _objects.items():
@@ -1294,3 +1418,12 @@ _SUPPORTED_ATTRS = {
                       ATTR_LAST_NAME, ATTR_USERNAME},
     TCMS_CLASS_VERSION: {ATTR_ID, ATTR_PRODUCT, ATTR_VALUE},
 }
+
+
+# TCMS classes holding lookup values, see TcmsInterface.lookup_objects
+_LOOKUP_CLASS_IDS = {TCMS_CLASS_ID_PLAN_TYPE, TCMS_CLASS_ID_PRIORITY, TCMS_CLASS_ID_TEST_CASE_STATUS,
+                     TCMS_CLASS_ID_TEST_EXECUTION_STATUS}
+
+# Worker threads for TCMS requests issued in parallel. Threads are started on demand and kept, so that every
+# worker reuses its XML-RPC connection
+_REQUEST_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='issai-tcms')
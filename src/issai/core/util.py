@@ -138,10 +138,8 @@ def python_value(value):
     :param value: the tomlkit value
     :return: the pure Python value
     """
-    try:
-        return value.unwrap()
-    except AttributeError:
-        return value
+    _unwrap = getattr(value, 'unwrap', None)
+    return value if _unwrap is None else _unwrap()
 
 
 class PropertyMatrix:
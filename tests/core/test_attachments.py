@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# issai - Framework to run tests specified in Kiwi Test Case Management System
+#
+# Copyright (c) 2024, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests for the attachment download handling in module core.attachments.
+"""
+from concurrent.futures import Future
+import threading
+import unittest
+from unittest import mock
+
+from issai.core import *
+from issai.core.attachments import start_attachment_downloads, wait_for_attachment_downloads
+from issai.core.issai_exception import IssaiException
+from issai.core.messages import *
+from issai.core.task import TaskMonitor
+
+
+class TestAttachmentDownloads(unittest.TestCase):
+    def test_progress_reported_by_calling_thread(self):
+        _entity = mock.MagicMock()
+        _entity.attachments.return_value = {TCMS_CLASS_ID_TEST_CASE: {84: ['a.txt', 'b.txt'], 85: ['c.txt']}}
+        _log_threads = []
+        _task_monitor = mock.MagicMock()
+        _task_monitor.is_dry_run.return_value = False
+        _task_monitor.log.side_effect = lambda *_args: _log_threads.append(threading.current_thread())
+        with mock.patch('issai.core.attachments.download_attachment', side_effect=lambda *_args: _args[2]):
+            _downloads = start_attachment_downloads(_entity, '/tmp', _task_monitor)
+            wait_for_attachment_downloads(_downloads, _task_monitor)
+        _file_logs = [_call.args for _call in _task_monitor.log.call_args_list[1:]]
+        self.assertEqual({(I_DOWNLOAD_ATTACHMENT, _f) for _f in ('a.txt', 'b.txt', 'c.txt')}, set(_file_logs))
+        self.assertEqual([threading.current_thread()] * 4, _log_threads)
+
+    def test_pending_downloads_cancelled_on_failure(self):
+        _failed = Future()
+        _failed.set_exception(IssaiException(E_DOWNLOAD_ATTACHMENT_FAILED, 'a.txt', 'error'))
+        _pending = Future()
+        self.assertRaises(IssaiException, wait_for_attachment_downloads, [_failed, _pending], TaskMonitor())
+        self.assertTrue(_pending.cancelled())
+
+    def test_pending_downloads_cancelled_on_abort(self):
+        _done = Future()
+        _done.set_result('a.txt')
+        _pending = Future()
+        _task_monitor = TaskMonitor()
+        _task_monitor.request_abort()
+        self.assertRaises(IssaiException, wait_for_attachment_downloads, [_done, _pending], _task_monitor)
+        self.assertTrue(_pending.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -146,6 +146,7 @@ class TestEntitiesMasterData(unittest.TestCase):
         _master_data = TestEntitiesMasterData._default_master_data()
         for _status in T_EXECUTION_STATUSES:
             self.assertEqual(_status[ATTR_ID], _master_data.execution_status_id_of(_status[ATTR_NAME]))
+            self.assertEqual(_status[ATTR_ID], _master_data.execution_status_id_of(_status[ATTR_NAME].lower()))
         self.assertRaises(IssaiException, _master_data.execution_status_id_of, 'XYZ')
 
     def test_replace_object(self):
@@ -160,6 +161,11 @@ class TestEntitiesMasterData(unittest.TestCase):
         _toml_data = _master_data.to_toml()
         _clone = MasterData.from_toml(_toml_data)
         self._verify_master_data(_master_data, _clone)
+        # indexes must have been built for the loaded objects
+        for _status in T_EXECUTION_STATUSES:
+            self.assertEqual(_status[ATTR_ID], _clone.execution_status_id_of(_status[ATTR_NAME].lower()))
+        _clone.replace_object(TCMS_CLASS_ID_USER, 5, T_DB_USER_TMADMIN)
+        self._verify_replace(_master_data, _clone, TCMS_CLASS_ID_USER, 5, T_DB_USER_TMADMIN[ATTR_ID])
 
     @staticmethod
     def _default_master_data():
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# issai - Framework to run tests specified in Kiwi Test Case Management System
+#
+# Copyright (c) 2024, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests for module core.exporter.
+"""
+from concurrent.futures import Future
+import unittest
+from unittest import mock
+
+from issai.core import *
+from issai.core.exporter import export_product, _write_output
+from issai.core.issai_exception import IssaiException
+from issai.core.messages import *
+from issai.core.task import TaskMonitor
+
+
+class TestExporter(unittest.TestCase):
+    def test_downloads_cancelled_if_output_file_fails(self):
+        _pending = Future()
+        with mock.patch('issai.core.exporter.start_attachment_downloads', return_value=[_pending]), \
+                mock.patch('issai.core.exporter._write_output_file', side_effect=OSError('disk full')):
+            self.assertRaises(OSError, _write_output, mock.MagicMock(), '/tmp', 'out.toml', True, TaskMonitor())
+        self.assertTrue(_pending.cancelled())
+
+    def test_requests_cancelled_if_export_fails(self):
+        _pending = Future()
+        _error = IssaiException(E_TCMS_FIND_OBJECT_FAILED, TCMS_CLASS_PRODUCT, 'error')
+        with mock.patch('issai.core.exporter.submit_tcms_request', return_value=_pending), \
+                mock.patch('issai.core.exporter.find_tcms_object', side_effect=_error):
+            self.assertRaises(IssaiException, export_product, 'Issai', {OPTION_INCLUDE_ENVIRONMENTS: True}, '/tmp',
+                              TaskMonitor())
+        self.assertTrue(_pending.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
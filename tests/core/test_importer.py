@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# issai - Framework to run tests specified in Kiwi Test Case Management System
+#
+# Copyright (c) 2024, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests for module core.importer.
+"""
+from concurrent.futures import Future
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from issai.core import *
+from issai.core.attachments import attachment_file_path, upload_attachment_file
+from issai.core.entities import PlanResultEntity
+from issai.core.importer import import_file, _import_plans, _upload_attachments, _MASTER_DATA_IMPORT_ORDER
+from issai.core.issai_exception import IssaiException
+from issai.core.messages import *
+from issai.core.task import TaskMonitor
+
+
+# TEST DATA
+T_CURRENT_USER = {'id': 5, 'username': 'tmadmin'}
+T_TESTER = {'id': 4, 'username': 'tester'}
+T_TCMS_CASES = [{'id': 84, 'summary': 'Case84'}]
+T_TCMS_EXECUTIONS = [{'id': 201, 'case': 84, 'run': 31}]
+T_TCMS_PLANS = [{'id': 18, 'name': 'Plan18'}]
+T_TCMS_RUNS = [{'id': 31, 'plan': 18}]
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._file_path = os.path.join(self._tmp_dir.name, 'testplan_18.toml')
+        _patches = [mock.patch('issai.core.importer.TcmsInterface.current_user', return_value=T_CURRENT_USER),
+                    mock.patch('issai.core.importer.TcmsInterface.execution_status_id_for', return_value=4)]
+        for _patch in _patches:
+            _patch.start()
+            self.addCleanup(_patch.stop)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_import_plan_result_with_attachments(self):
+        _options = {OPTION_DRY_RUN: True, OPTION_INCLUDE_ATTACHMENTS: True}
+        with mock.patch('issai.core.importer.find_tcms_objects_concurrently', side_effect=_find_tcms_objects):
+            _result = import_file(_plan_result(), _options, self._file_path, TaskMonitor())
+        self.assertTrue(_result.task_succeeded())
+
+    def test_upload_plan_result_output_files(self):
+        _entity = _plan_result()
+        _entity[ATTR_TEST_CASE_RESULTS][201][ATTR_OUTPUT_FILES] = ['case.log']
+        _entity[ATTR_TEST_PLAN_RESULTS][31][ATTR_OUTPUT_FILES] = ['run.log']
+        _uploads = []
+
+        def _submit(_function, *_args):
+            _uploads.append((_function, *_args))
+            _upload = Future()
+            _upload.set_result(None)
+            return _upload
+
+        with mock.patch('issai.core.importer.submit_tcms_request', side_effect=_submit):
+            _upload_attachments(_entity, {}, self._file_path, TaskMonitor())
+        # all output files are attached to the test run
+        _input_path = self._tmp_dir.name
+        self.assertEqual([(upload_attachment_file,
+                           attachment_file_path(_input_path, 'case.log', TCMS_CLASS_ID_TEST_EXECUTION, 201),
+                           'testexecution_201_case.log', TCMS_CLASS_ID_TEST_RUN, 31),
+                          (upload_attachment_file,
+                           attachment_file_path(_input_path, 'run.log', TCMS_CLASS_ID_TEST_RUN, 31),
+                           'run.log', TCMS_CLASS_ID_TEST_RUN, 31)], _uploads)
+
+    def test_pending_uploads_cancelled_on_failure(self):
+        _url = 'https://server.issai.local/uploads/attachments/testcases_testcase/84/{}.txt'
+        _entity = mock.MagicMock()
+        _entity.attachments.return_value = {TCMS_CLASS_ID_TEST_CASE: {84: [_url.format(_n) for _n in 'abc']}}
+        _failed = Future()
+        _failed.set_exception(IssaiException(E_TCMS_UPLOAD_ATTACHMENT_FAILED, 'a.txt', 'error'))
+        _pending = [Future(), Future()]
+        with mock.patch('issai.core.importer.submit_tcms_request', side_effect=[_failed, *_pending]):
+            self.assertRaises(IssaiException, _upload_attachments, _entity, {}, self._file_path, TaskMonitor())
+        self.assertTrue(all(_upload.cancelled() for _upload in _pending))
+
+    def test_import_plans_parents_first(self):
+        # children stored before their parents, plan 4 has a parent not contained in the file
+        _parent_ids = {3: 2, 2: 1, 4: 99, 1: None, 5: None}
+        _plans = {_id: {ATTR_ID: _id, ATTR_NAME: f'Plan{_id}', ATTR_PARENT: _parent_id}
+                  for _id, _parent_id in _parent_ids.items()}
+        _container = mock.MagicMock()
+        _container.__getitem__.side_effect = {ATTR_TEST_PLANS: _plans}.__getitem__
+        _created_ids = []
+
+        def _create_plan(_class_id, _plan):
+            _created_ids.append(_plan[ATTR_ID])
+            return {ATTR_ID: _plan[ATTR_ID] + 100}
+
+        with mock.patch('issai.core.importer.create_tcms_object', side_effect=_create_plan):
+            _import_plans(_container, False, TaskMonitor())
+        self.assertEqual([1, 5, 2, 3], _created_ids)
+
+    def test_import_plan_result_bulk_reads(self):
+        _queries = []
+
+        def _find(_class_queries):
+            _queries.append(_class_queries)
+            return _find_tcms_objects(_class_queries)
+
+        with mock.patch('issai.core.importer.find_tcms_objects_concurrently', side_effect=_find), \
+                mock.patch('issai.core.importer.update_execution') as _update_execution, \
+                mock.patch('issai.core.importer.update_run') as _update_run:
+            _result = import_file(_plan_result(), {}, self._file_path, TaskMonitor())
+        self.assertTrue(_result.task_succeeded())
+        # one request per TCMS class, cases and plans are read after executions and runs
+        self.assertEqual([[(TCMS_CLASS_ID_TEST_EXECUTION, {'id__in': [201]}),
+                           (TCMS_CLASS_ID_USER, {'username__in': ['tester']}),
+                           (TCMS_CLASS_ID_TEST_RUN, {'id__in': [31]})],
+                          [(TCMS_CLASS_ID_TEST_CASE, {'id__in': [84]}),
+                           (TCMS_CLASS_ID_TEST_PLAN, {'id__in': [18]})]], _queries)
+        _update_execution.assert_called_once_with(201, {ATTR_TESTED_BY: 4, ATTR_STATUS: 4, ATTR_START_DATE: None,
+                                                        ATTR_STOP_DATE: None}, '')
+        _update_run.assert_called_once_with(31, {ATTR_START_DATE: None, ATTR_STOP_DATE: None})
+
+    def test_import_plan_result_without_case_results(self):
+        _queries = []
+
+        def _find(_class_queries):
+            _queries.append(_class_queries)
+            return _find_tcms_objects(_class_queries)
+
+        _entity = _plan_result()
+        _entity[ATTR_TEST_CASE_RESULTS].clear()
+        with mock.patch('issai.core.importer.find_tcms_objects_concurrently', side_effect=_find), \
+                mock.patch('issai.core.importer.update_execution') as _update_execution, \
+                mock.patch('issai.core.importer.update_run') as _update_run:
+            _result = import_file(_entity, {}, self._file_path, TaskMonitor())
+        self.assertTrue(_result.task_succeeded())
+        # no requests for executions, users and cases
+        self.assertEqual([[(TCMS_CLASS_ID_TEST_RUN, {'id__in': [31]})],
+                          [(TCMS_CLASS_ID_TEST_PLAN, {'id__in': [18]})]], _queries)
+        _update_execution.assert_not_called()
+        _update_run.assert_called_once_with(31, {ATTR_START_DATE: None, ATTR_STOP_DATE: None})
+
+    def test_import_plan_result_errors(self):
+        _options = {OPTION_DRY_RUN: True}
+        _cases = [(_plan_result(case_name='Other'), E_IMP_OWNING_OBJECT_MISMATCH),
+                  (_plan_result(plan_name='Other'), E_IMP_OWNING_OBJECT_MISMATCH)]
+        for _entity, _error_id in _cases:
+            with mock.patch('issai.core.importer.find_tcms_objects_concurrently', side_effect=_find_tcms_objects):
+                with self.assertRaises(IssaiException) as _cm:
+                    import_file(_entity, _options, self._file_path, TaskMonitor())
+                self.assertEqual(_error_id, _cm.exception.id())
+        # objects missing in TCMS
+        for _missing_class_id in (TCMS_CLASS_ID_TEST_EXECUTION, TCMS_CLASS_ID_TEST_RUN):
+            def _find_without(_queries):
+                return [[] if _class_id == _missing_class_id else _objects
+                        for (_class_id, _), _objects in zip(_queries, _find_tcms_objects(_queries))]
+            with mock.patch('issai.core.importer.find_tcms_objects_concurrently', side_effect=_find_without):
+                with self.assertRaises(IssaiException) as _cm:
+                    import_file(_plan_result(), _options, self._file_path, TaskMonitor())
+                self.assertEqual(E_TCMS_SUBORDINATE_OBJECT_NOT_FOUND, _cm.exception.id())
+
+    def test_import_plan_result_unknown_tester(self):
+        with mock.patch('issai.core.importer.find_tcms_objects_concurrently', side_effect=_find_tcms_objects):
+            _options = {OPTION_DRY_RUN: True, OPTION_USER_REFERENCES: OPTION_VALUE_USER_REF_REPLACE_NEVER}
+            with self.assertRaises(IssaiException) as _cm:
+                import_file(_plan_result(tester_name='nobody'), _options, self._file_path, TaskMonitor())
+            self.assertEqual(E_IMP_USER_NOT_FOUND, _cm.exception.id())
+            with mock.patch('issai.core.importer.update_execution') as _update_execution, \
+                    mock.patch('issai.core.importer.update_run'):
+                import_file(_plan_result(tester_name='nobody'), {}, self._file_path, TaskMonitor())
+            # tester replaced by current user
+            self.assertEqual(T_CURRENT_USER[ATTR_ID], _update_execution.call_args.args[1][ATTR_TESTED_BY])
+
+    def test_master_data_import_order(self):
+        self.assertEqual(set(MASTER_DATA_TYPE_TCMS_CLASS_IDS.values()), set(_MASTER_DATA_IMPORT_ORDER))
+        self.assertLess(_MASTER_DATA_IMPORT_ORDER.index(TCMS_CLASS_ID_VERSION),
+                        _MASTER_DATA_IMPORT_ORDER.index(TCMS_CLASS_ID_BUILD))
+
+
+def _plan_result(case_name='Case84', plan_name='Plan18', tester_name='tester'):
+    """
+    :returns: test plan result with one test case result and no output files
+    :rtype: PlanResultEntity
+    """
+    _toml_data = {ATTR_TEST_PLAN_RESULTS: [{ATTR_RUN: 31, ATTR_PLAN: 18, ATTR_PLAN_NAME: plan_name,
+                                            ATTR_START_DATE: None, ATTR_STOP_DATE: None, ATTR_OUTPUT_FILES: [],
+                                            ATTR_NOTES: '', ATTR_SUMMARY: '', ATTR_CASE_RESULTS: [201],
+                                            ATTR_CHILD_PLAN_RESULTS: []}],
+                  ATTR_TEST_CASE_RESULTS: [{ATTR_EXECUTION: 201, ATTR_CASE: 84, ATTR_CASE_NAME: case_name,
+                                            ATTR_STATUS: 'PASSED', ATTR_TESTER_NAME: tester_name,
+                                            ATTR_START_DATE: None, ATTR_STOP_DATE: None, ATTR_COMMENT: '',
+                                            ATTR_OUTPUT_FILES: []}]}
+    return PlanResultEntity.from_toml(31, plan_name, _toml_data)
+
+
+def _find_tcms_objects(queries):
+    """
+    Stub for concurrent TCMS object reads, returns the objects of the test data matching the ID or user name.
+    :param list queries: the TCMS class IDs and filters
+    :returns: matching objects for every query
+    :rtype: list
+    """
+    _objects = {TCMS_CLASS_ID_TEST_CASE: T_TCMS_CASES, TCMS_CLASS_ID_TEST_EXECUTION: T_TCMS_EXECUTIONS,
+                TCMS_CLASS_ID_TEST_PLAN: T_TCMS_PLANS, TCMS_CLASS_ID_TEST_RUN: T_TCMS_RUNS,
+                TCMS_CLASS_ID_USER: [T_TESTER, T_CURRENT_USER]}
+    _results = []
+    for _class_id, _filter in queries:
+        _attr, _values = next(iter(_filter.items()))
+        _attr = _attr.split('__')[0]
+        _results.append([_obj for _obj in _objects[_class_id] if _obj[_attr] in _values])
+    return _results
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# -----------------------------------------------------------------------------------------------
+# issai - Framework to run tests specified in Kiwi Test Case Management System
+#
+# Copyright (c) 2024, Frank Sommer.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------------------------
+
+"""
+Unit tests for lookup value handling and concurrent requests in module core.tcms.
+"""
+from concurrent.futures import Future
+import unittest
+from unittest import mock
+
+from issai.core import *
+from issai.core.issai_exception import IssaiException
+from issai.core.messages import *
+from issai.core.tcms import TcmsInterface, find_lookup_objects, find_tcms_objects_concurrently
+
+
+# TEST DATA
+T_CASE_STATUS_CONFIRMED = {'id': 2, 'name': 'CONFIRMED', 'description': '', 'is_confirmed': True}
+T_CASE_STATUS_NEW = {'id': 3, 'name': 'REVIEWED', 'description': '', 'is_confirmed': False}
+T_PLAN_TYPE_UNIT = {'id': 1, 'name': 'Unit', 'description': ''}
+T_PLAN_TYPE_NEW = {'id': 9, 'name': 'Soak', 'description': ''}
+
+
+class TestTcmsLookupObjects(unittest.TestCase):
+    def setUp(self):
+        _patches = [mock.patch.object(TcmsInterface, '_initialized', True),
+                    mock.patch.object(TcmsInterface, '_case_statuses_by_id', {2: T_CASE_STATUS_CONFIRMED}),
+                    mock.patch.object(TcmsInterface, '_case_statuses_by_name', {'CONFIRMED': T_CASE_STATUS_CONFIRMED}),
+                    mock.patch.object(TcmsInterface, '_lookup_objects', {})]
+        for _patch in _patches:
+            _patch.start()
+            self.addCleanup(_patch.stop)
+
+    def test_case_statuses(self):
+        with mock.patch('issai.core.tcms.find_tcms_objects') as _find:
+            self.assertEqual([T_CASE_STATUS_CONFIRMED], find_lookup_objects(TCMS_CLASS_ID_TEST_CASE_STATUS, [2]))
+            TcmsInterface.object_created(TCMS_CLASS_ID_TEST_CASE_STATUS, T_CASE_STATUS_NEW)
+            self.assertEqual([T_CASE_STATUS_CONFIRMED, T_CASE_STATUS_NEW],
+                             find_lookup_objects(TCMS_CLASS_ID_TEST_CASE_STATUS, [2, 3]))
+            # statuses are known from connect, no request needed
+            _find.assert_not_called()
+
+    def test_plan_types(self):
+        with mock.patch('issai.core.tcms.find_tcms_objects', return_value=[T_PLAN_TYPE_UNIT]) as _find:
+            self.assertEqual([T_PLAN_TYPE_UNIT], find_lookup_objects(TCMS_CLASS_ID_PLAN_TYPE, [1]))
+            self.assertEqual([T_PLAN_TYPE_UNIT], find_lookup_objects(TCMS_CLASS_ID_PLAN_TYPE, [1]))
+            self.assertEqual(1, _find.call_count)
+            TcmsInterface.object_created(TCMS_CLASS_ID_PLAN_TYPE, T_PLAN_TYPE_NEW)
+            _find.return_value = [T_PLAN_TYPE_UNIT, T_PLAN_TYPE_NEW]
+            self.assertEqual([T_PLAN_TYPE_UNIT, T_PLAN_TYPE_NEW], find_lookup_objects(TCMS_CLASS_ID_PLAN_TYPE, [1, 9]))
+            self.assertEqual(2, _find.call_count)
+
+    def test_stale_cache(self):
+        # objects created by another user after the class was read are found by reading the class again
+        TcmsInterface._lookup_objects[TCMS_CLASS_ID_PLAN_TYPE] = [T_PLAN_TYPE_UNIT]
+        with mock.patch('issai.core.tcms.find_tcms_objects', return_value=[T_PLAN_TYPE_UNIT, T_PLAN_TYPE_NEW]) as _find:
+            self.assertEqual([T_PLAN_TYPE_NEW], find_lookup_objects(TCMS_CLASS_ID_PLAN_TYPE, [9]))
+            self.assertEqual([T_PLAN_TYPE_NEW], find_lookup_objects(TCMS_CLASS_ID_PLAN_TYPE, [9]))
+            _find.assert_called_once_with(TCMS_CLASS_ID_PLAN_TYPE, {})
+        with mock.patch('issai.core.tcms.find_tcms_objects', return_value=[T_CASE_STATUS_CONFIRMED,
+                                                                          T_CASE_STATUS_NEW]) as _find:
+            self.assertEqual([T_CASE_STATUS_NEW], find_lookup_objects(TCMS_CLASS_ID_TEST_CASE_STATUS, [3]))
+            self.assertEqual([T_CASE_STATUS_NEW], find_lookup_objects(TCMS_CLASS_ID_TEST_CASE_STATUS, [3]))
+            _find.assert_called_once_with(TCMS_CLASS_ID_TEST_CASE_STATUS, {})
+        # unknown objects are not found even after reading again
+        with mock.patch('issai.core.tcms.find_tcms_objects', return_value=[T_PLAN_TYPE_UNIT]):
+            self.assertEqual([], find_lookup_objects(TCMS_CLASS_ID_PLAN_TYPE, [7]))
+
+class TestTcmsConcurrentRequests(unittest.TestCase):
+    def test_pending_queries_cancelled_on_failure(self):
+        _failed = Future()
+        _failed.set_exception(IssaiException(E_TCMS_FIND_OBJECT_FAILED, TCMS_CLASS_PRODUCT, 'error'))
+        _pending = Future()
+        with mock.patch('issai.core.tcms.submit_tcms_request', side_effect=[_failed, _pending]):
+            self.assertRaises(IssaiException, find_tcms_objects_concurrently,
+                              [(TCMS_CLASS_ID_PRODUCT, {}), (TCMS_CLASS_ID_VERSION, {})])
+        self.assertTrue(_pending.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,6 +38,8 @@ Unit tests for core.util.
 
 import unittest
 
+import tomlkit
+
 from issai.core.util import *
 
 DUMMY_FILE_PATH = '/tmp/config.toml'
@@ -107,6 +109,21 @@ class TestUtil(unittest.TestCase):
         self.assertEqual('SCHEME=noneSCHEME=versionSCHEME=buildSCHEME=noneSCHEME=versionSCHEME=build'
                          'SCHEME=noneSCHEME=versionSCHEME=build', _res['SCHEME'])
 
+    def test_python_value(self):
+        """
+        Tests function python_value.
+        """
+        _doc = tomlkit.parse('i = 7\ns = "text"\nb = true\na = [1, 2]\n')
+        self.assertEqual(7, python_value(_doc['i']))
+        self.assertIs(int, type(python_value(_doc['i'])))
+        self.assertIs(str, type(python_value(_doc['s'])))
+        self.assertIs(True, python_value(_doc['b']))
+        self.assertEqual([1, 2], python_value(_doc['a']))
+        self.assertIs(list, type(python_value(_doc['a'])))
+        # plain Python values are returned unchanged
+        self.assertEqual('text', python_value('text'))
+        self.assertIsNone(python_value(None))
+
 
 if __name__ == '__main__':
     unittest.main()